@@ -1,13 +1,73 @@
+import time
+START = time.perf_counter()
+
 import sys
+import argparse
 from PyQt5.QtWidgets import (QApplication)
-from PyQt5.QtGui import QIcon
-from resources import *
+from PyQt5.QtCore import Qt
+IMPORTS_QT = time.perf_counter()
 
 from models.OverlayManager import OverlayManager
+from platforms import BACKENDS, createBackend, setBackend
+from utils.icons import getAppIcon
+from utils.startup_profile import StartupProfiler
+IMPORTS_APP = time.perf_counter()
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="OverlayXpert")
+    parser.add_argument("--poll-interval", type=int, default=1000,
+                        help="foreground polling interval in ms when no focus events are available (0 disables polling)")
+    parser.add_argument("--no-foreground-events", action="store_true",
+                        help="always poll the foreground window instead of listening for focus changes")
+    parser.add_argument("--backend", choices=BACKENDS, default="auto",
+                        help="window-system backend; 'fake' runs headless with an in-memory desktop")
+    parser.add_argument("--render-mode", choices=["window", "composite"], default="window",
+                        help="one native window per overlay, or one transparent host per monitor that paints every overlay")
+    parser.add_argument("--icon", default=None,
+                        help="icon file (.ico/.png) or compiled resource bundle (.rcc) to use instead of the embedded resources")
+    parser.add_argument("--profile-startup", nargs="?", const="startup_profile.json", default=None, metavar="PATH",
+                        help="write per-phase startup timings as JSON (default: startup_profile.json)")
+    parser.add_argument("--exit-after-startup", action="store_true",
+                        help="quit once the first window has painted and the icon is loaded")
+    parser.add_argument("--release-idle", type=float, default=0, metavar="SECONDS",
+                        help="destroy an overlay's window after it has been hidden this long (0 keeps it)")
+    args, _ = parser.parse_known_args(argv[1:])
+    return args
 
 if __name__ == "__main__":
+    profiler = StartupProfiler(START)
+    profiler.mark("imports_qt", IMPORTS_QT)
+    profiler.mark("imports_app", IMPORTS_APP)
+    args = parse_args(sys.argv)
+    setBackend(createBackend(args.backend))
+    profiler.mark("platform_backend")
+    # Overlay geometry is kept in device-independent pixels; Qt scales it per
+    # monitor and renders at each monitor's device pixel ratio.
+    QApplication.setAttribute(Qt.AA_EnableHighDpiScaling)
+    QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps)
+    QApplication.setHighDpiScaleFactorRoundingPolicy(Qt.HighDpiScaleFactorRoundingPolicy.PassThrough)
     app = QApplication(sys.argv)
-    app.setWindowIcon(QIcon(":icon.ico"))
-    window = OverlayManager()
+    profiler.mark("qapplication")
+    window = OverlayManager(
+        poll_interval=args.poll_interval,
+        foreground_events=not args.no_foreground_events,
+        render_mode=args.render_mode,
+        profiler=profiler,
+        release_after=args.release_idle
+    )
     window.show()
+    profiler.mark("show")
+
+    def on_first_paint():
+        profiler.mark("first_paint")
+        # The icon is resolved and decoded after the first paint instead of before it.
+        app.setWindowIcon(getAppIcon(args.icon))
+        profiler.mark("icon")
+        if args.profile_startup:
+            profiler.write(args.profile_startup)
+        if args.exit_after_startup:
+            window.close()
+            app.quit()
+
+    window.first_painted.connect(on_first_paint)
     sys.exit(app.exec_())
@@ -0,0 +1,80 @@
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OVERLAYXPERT_PLATFORM", "fake")
+
+from PyQt5.QtWidgets import QApplication
+
+from models.OverlayManager import OverlayManager
+from models.OverlayModel import OverlayModel
+
+OVERLAY_COUNT = 5000
+
+
+def make_record(index):
+    # Bound to a process that is not in the foreground, as most overlays in a large layout are.
+    return {
+        "x": (index * 37) % 1800, "y": (index * 53) % 1000, "width": 120, "height": 80,
+        "color": f"#{index % 255:02x}60b0", "border": 2, "opacity": 1.0,
+        "process": f"game{index % 50}.exe", "active": True,
+    }
+
+
+def timed(app, action):
+    start = time.perf_counter()
+    action()
+    app.processEvents()
+    return (time.perf_counter() - start) * 1000
+
+
+def add_one_by_one(manager, count):
+    for index in range(count):
+        manager.collection.add(OverlayModel(**make_record(index)))
+
+
+def add_batch(manager, count):
+    manager.add_overlays(OverlayModel(**make_record(index)) for index in range(count))
+
+
+def remove_one_by_one(manager):
+    for overlay_id in [model.id for model in manager.collection]:
+        manager.collection.remove(overlay_id)
+
+
+def delete_selected(manager):
+    manager.overlay_table.selectAll()
+    manager.delete_overlay()
+
+
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+    os.chdir(tempfile.mkdtemp())
+    with open("overlays.json", "w") as file:
+        json.dump([dict(make_record(index), id=index + 1) for index in range(OVERLAY_COUNT)], file)
+    with open("import.json", "w") as file:
+        json.dump([make_record(index) for index in range(OVERLAY_COUNT)], file)
+
+    manager = OverlayManager(poll_interval=0, foreground_events=False)
+    manager.show()
+    app.processEvents()
+
+    results = [
+        ("load_from_json", timed(app, manager.load_from_json)),
+        ("delete selected (batch)", timed(app, lambda: delete_selected(manager))),
+        ("import (batch)", timed(app, lambda: manager.import_overlays("import.json"))),
+        ("remove one by one", timed(app, lambda: remove_one_by_one(manager))),
+        ("add one by one", timed(app, lambda: add_one_by_one(manager, OVERLAY_COUNT))),
+        ("delete selected (batch)", timed(app, lambda: delete_selected(manager))),
+        ("add_overlays (batch)", timed(app, lambda: add_batch(manager, OVERLAY_COUNT))),
+    ]
+    windows = len(manager.overlays)
+    manager.close()
+
+    print(f"{OVERLAY_COUNT} overlays, {windows} native windows created")
+    print(f"{'operation':>24} {'ms':>9}")
+    for name, ms in results:
+        print(f"{name:>24} {ms:>9.1f}")
@@ -0,0 +1,71 @@
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OVERLAYXPERT_PLATFORM", "fake")
+
+from PyQt5.QtWidgets import QApplication
+
+from models.OverlayManager import OverlayManager
+from platforms import getBackend
+from utils.helpers import overlayMatches
+
+OVERLAY_COUNTS = [100, 1000, 5000, 20000]
+OVERLAYS_PER_PROCESS = 10
+SWITCHES = 200
+
+
+def make_records(count, anchored=0):
+    # Every process has the same number of overlays, so the work a focus change
+    # really needs is the same whatever the total.
+    processes = count // OVERLAYS_PER_PROCESS
+    return [
+        {"id": index + 1, "x": (index * 37) % 1800, "y": (index * 53) % 1000, "width": 120, "height": 80,
+         "process": f"app{index % processes}.exe", "active": True, "anchor": index < anchored}
+        for index in range(count)
+    ]
+
+
+def full_scan(manager):
+    # What check_processes did before the index: every overlay, every change.
+    snapshot = manager.foreground.refresh()
+    for model in manager.collection:
+        manager.apply_visibility(model, overlayMatches(model, snapshot))
+
+
+def measure(app, count, check, anchored=0):
+    os.chdir(tempfile.mkdtemp())
+    with open("overlays.json", "w") as file:
+        json.dump(make_records(count, anchored), file)
+
+    backend = getBackend()
+    backend.add_window(1, 100, "app0.exe", title="App 0")
+    backend.add_window(2, 101, "app1.exe", title="App 1")
+    manager = OverlayManager(poll_interval=0, foreground_events=False)
+    app.processEvents()
+
+    check(manager)
+    start = time.perf_counter()
+    for switch in range(SWITCHES):
+        backend.set_foreground(1 + switch % 2)
+        check(manager)
+    elapsed = (time.perf_counter() - start) / SWITCHES * 1000
+
+    manager.close()
+    backend.remove_window(1)
+    backend.remove_window(2)
+    return elapsed
+
+
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+    print(f"{'overlays':>8} {'full scan ms':>13} {'indexed ms':>11} {'anchored ms':>12}")
+    for count in OVERLAY_COUNTS:
+        scan = measure(app, count, full_scan)
+        indexed = measure(app, count, OverlayManager.check_processes)
+        # One overlay anchored to a window: the rebind pass stays per anchored overlay.
+        anchored = measure(app, count, OverlayManager.check_processes, anchored=1)
+        print(f"{count:>8} {scan:>13.3f} {indexed:>11.3f} {anchored:>12.3f}")
@@ -0,0 +1,63 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OVERLAYXPERT_PLATFORM", "fake")
+
+from platforms import getBackend
+from utils.foreground import ForegroundService, getForegroundSnapshot
+
+OVERLAY_COUNTS = [1, 10, 60, 250, 1000]
+TICKS = 50
+QUERIES = ("foreground_window", "window_pid", "process_name")
+
+
+class CountingBackend:
+    # Counts the foreground queries that reach the backend; under the headless
+    # fake backend they cost nothing, so their number is what the tick costs.
+    def __init__(self, backend):
+        self.backend = backend
+        self.calls = 0
+
+    def __getattr__(self, name):
+        method = getattr(self.backend, name)
+        if name not in QUERIES:
+            return method
+
+        def counted(*args):
+            self.calls += 1
+            return method(*args)
+        return counted
+
+
+def per_overlay_tick(count, backend, service):
+    # What every overlay used to do: resolve the foreground on its own.
+    for _ in range(count):
+        getForegroundSnapshot(backend=backend)
+
+
+def snapshot_tick(count, backend, service):
+    service.refresh()
+
+
+def measure(tick, count):
+    backend = CountingBackend(getBackend())
+    service = ForegroundService(backend=backend)
+    start = time.perf_counter()
+    for tick_index in range(TICKS):
+        # A new foreground every tick, so the shared snapshot cannot be reused.
+        backend.backend.set_foreground(1 + tick_index % 2)
+        tick(count, backend, service)
+    return (time.perf_counter() - start) / TICKS * 1000, backend.calls / TICKS
+
+
+if __name__ == "__main__":
+    getBackend().add_window(1, 100, "game.exe", title="Game")
+    getBackend().add_window(2, 101, "notepad.exe", title="Notepad")
+    print("Foreground resolution only: ms and backend queries per tick")
+    print(f"{'overlays':>8} {'per-overlay ms':>15} {'queries':>8} {'snapshot ms':>12} {'queries':>8}")
+    for count in OVERLAY_COUNTS:
+        legacy_ms, legacy_calls = measure(per_overlay_tick, count)
+        shared_ms, shared_calls = measure(snapshot_tick, count)
+        print(f"{count:>8} {legacy_ms:>15.3f} {legacy_calls:>8.0f} {shared_ms:>12.4f} {shared_calls:>8.0f}")
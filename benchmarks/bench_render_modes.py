@@ -0,0 +1,106 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication
+
+from models.OverlayCanvas import OverlayCompositor
+from models.OverlayModel import OverlayCollection, OverlayModel
+from models.OverlayWidget import OverlayWidget
+from utils.foreground import ForegroundSnapshot
+from utils.helpers import overlayMatches
+
+OVERLAY_COUNTS = [25, 100, 250]
+ROUNDS = 5
+
+
+class StubForeground:
+    def __init__(self):
+        self.snapshot = ForegroundSnapshot(process="game.exe")
+
+
+class StubManager:
+    def __init__(self):
+        self.collection = OverlayCollection()
+        self.foreground = StubForeground()
+
+
+def build(mode, count):
+    manager = StubManager()
+    compositor = OverlayCompositor(manager) if mode == "composite" else None
+    overlays = []
+    for index in range(count):
+        model = OverlayModel(
+            x=(index * 37) % 1200, y=(index * 53) % 700, width=120, height=80,
+            color=f"#{index % 255:02x}60b0", border=2, process="game.exe" if index % 2 else "All"
+        )
+        manager.collection.add(model)
+        overlay = compositor.create_item(model) if compositor else OverlayWidget(manager, model)
+        overlays.append(overlay)
+    return manager, compositor, overlays
+
+
+def apply_visibility(overlay, snapshot):
+    should_show = overlayMatches(overlay.model, snapshot)
+    if should_show and not overlay.isVisible():
+        overlay.show()
+    elif not should_show and overlay.isVisible():
+        overlay.hide()
+
+
+def timed(app, action):
+    wall, cpu = time.perf_counter(), time.process_time()
+    action()
+    app.processEvents()
+    return (time.perf_counter() - wall) * 1000, (time.process_time() - cpu) * 1000
+
+
+def run(app, mode, count):
+    manager, compositor, overlays = build(mode, count)
+
+    def show_all():
+        for overlay in overlays:
+            apply_visibility(overlay, manager.foreground.snapshot)
+
+    def repaint_all():
+        for _ in range(ROUNDS):
+            if compositor:
+                for canvas in compositor.canvases:
+                    canvas.repaint()
+            else:
+                for overlay in overlays:
+                    overlay.repaint()
+
+    def focus_changes():
+        for process in ["other.exe", "game.exe"] * ROUNDS:
+            manager.foreground.snapshot = ForegroundSnapshot(process=process)
+            for overlay in overlays:
+                apply_visibility(overlay, manager.foreground.snapshot)
+            app.processEvents()
+
+    show = timed(app, show_all)
+    windows = sum(1 for widget in app.topLevelWidgets() if widget.isVisible())
+    repaint = timed(app, repaint_all)
+    focus = timed(app, focus_changes)
+
+    for overlay in overlays:
+        overlay.close()
+    if compositor:
+        compositor.close()
+    app.processEvents()
+    return windows, show, repaint, focus
+
+
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+    print(f"{'mode':>9} {'overlays':>8} {'windows':>7} {'show ms/cpu':>14} {'repaint ms/cpu':>15} {'focus ms/cpu':>14}")
+    for count in OVERLAY_COUNTS:
+        for mode in ("window", "composite"):
+            windows, show, repaint, focus = run(app, mode, count)
+            print(
+                f"{mode:>9} {count:>8} {windows:>7} "
+                f"{show[0]:>7.1f}/{show[1]:<6.1f} {repaint[0] / ROUNDS:>8.2f}/{repaint[1] / ROUNDS:<6.2f} "
+                f"{focus[0] / (2 * ROUNDS):>7.2f}/{focus[1] / (2 * ROUNDS):<6.2f}"
+            )
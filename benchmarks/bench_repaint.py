@@ -0,0 +1,61 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtGui import QPixmap
+from PyQt5.QtCore import Qt
+
+from models.OverlayModel import OverlayModel
+from models.OverlayPainter import OverlayPainter
+from models.OverlayWidget import OverlayWidget
+
+OVERLAY_COUNTS = [50, 100, 250, 500]
+FRAMES = 5
+
+
+class StubManager:
+    def __init__(self):
+        self.overlays = []
+
+
+def repaint_all(overlays, target, cached):
+    for overlay in overlays:
+        if cached is None:
+            overlay.paint_cache = None
+        target.fill(Qt.transparent)
+        overlay.render(target)
+
+
+def measure(overlays, target, cached):
+    # cached: None clears the paint resources every frame, "resources" keeps them,
+    # "pixmap" additionally blits the pre-rendered overlay from QPixmapCache.
+    OverlayPainter.use_pixmap_cache = cached == "pixmap"
+    repaint_all(overlays, target, cached)
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        repaint_all(overlays, target, cached)
+    return (time.perf_counter() - start) / FRAMES
+
+
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+    target = QPixmap(100, 100)
+
+    print(f"{'overlays':>8} {'uncached ms/frame':>18} {'resources ms/frame':>19} {'pixmap ms/frame':>16} {'pixmap us/overlay':>18}")
+    for count in OVERLAY_COUNTS:
+        manager = StubManager()
+        for overlay_id in range(1, count + 1):
+            model = OverlayModel(overlay_id, color=f"#{overlay_id % 255:02x}50a0", border=2)
+            manager.overlays.append(OverlayWidget(manager, model))
+
+        uncached = measure(manager.overlays, target, cached=None)
+        resources = measure(manager.overlays, target, cached="resources")
+        pixmap = measure(manager.overlays, target, cached="pixmap")
+        print(f"{count:>8} {uncached * 1000:>18.3f} {resources * 1000:>19.3f} {pixmap * 1000:>16.3f} {pixmap / count * 1e6:>18.2f}")
+
+        for overlay in manager.overlays:
+            overlay.deleteLater()
+        app.processEvents()
@@ -0,0 +1,134 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+START = time.perf_counter()
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+MODES = ("eager", "deferred", "file")
+RUNS = 5
+BUDGET_MS = float(os.environ.get("STARTUP_BUDGET_MS", 1500))
+
+
+def child(mode, icon_path):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    os.environ.setdefault("OVERLAYXPERT_PLATFORM", "fake")
+    os.chdir(tempfile.mkdtemp())
+
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtGui import QIcon
+
+    if mode == "eager":
+        # What app.py used to do: the resource module is imported and the icon
+        # set before the main window exists.
+        import resources  # noqa: F401
+    from models.OverlayManager import OverlayManager
+    from utils.icons import loadIcon
+    imports = time.perf_counter()
+
+    app = QApplication(sys.argv[:1])
+    if mode == "eager":
+        icon = QIcon(":icon.ico")
+        icon.pixmap(256)
+        app.setWindowIcon(icon)
+
+    window = OverlayManager(poll_interval=0)
+    window.show()
+    app.processEvents()
+    first_window = time.perf_counter()
+
+    if mode != "eager":
+        icon = loadIcon(icon_path if mode == "file" else None)
+        icon.pixmap(256)
+        app.setWindowIcon(icon)
+        app.processEvents()
+    icon_ready = time.perf_counter()
+
+    window.close()
+    print(json.dumps({
+        "imports": (imports - START) * 1000,
+        "first_window": (first_window - START) * 1000,
+        "icon_ready": (icon_ready - START) * 1000,
+    }))
+
+
+def extract_icon():
+    from utils.icons import extractIcon
+
+    return extractIcon(os.path.join(tempfile.mkdtemp(), "icon.ico"))
+
+
+def measure(mode, icon_path, runs):
+    results = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", mode, icon_path],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    return {key: statistics.median(result[key] for result in results) for key in results[0]}
+
+
+def profile_app(runs):
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    profiles = []
+    for _ in range(runs):
+        workdir = tempfile.mkdtemp()
+        path = os.path.join(workdir, "startup_profile.json")
+        subprocess.run(
+            [sys.executable, os.path.join(ROOT, "app.py"), "--backend", "fake",
+             "--profile-startup", path, "--exit-after-startup"],
+            cwd=workdir, env=env, capture_output=True, check=True, timeout=60,
+        )
+        with open(path) as file:
+            profiles.append(json.load(file))
+
+    phases = [phase["phase"] for phase in profiles[0]["phases"]]
+    medians = {
+        name: statistics.median(
+            next(phase for phase in profile["phases"] if phase["phase"] == name)["ms"] for profile in profiles
+        )
+        for name in phases
+    }
+    first_paint = statistics.median(
+        next(phase for phase in profile["phases"] if phase["phase"] == "first_paint")["at_ms"] for profile in profiles
+    )
+    return medians, first_paint
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        child(sys.argv[2], sys.argv[3])
+        sys.exit(0)
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS,
+                        help="fail when app.py takes longer than this to first paint (default: $STARTUP_BUDGET_MS or 1500)")
+    parser.add_argument("--runs", type=int, default=RUNS)
+    args = parser.parse_args()
+
+    icon_path = extract_icon()
+    print(f"{'mode':>9} {'imports ms':>11} {'first window ms':>16} {'icon ready ms':>14}")
+    for mode in MODES:
+        result = measure(mode, icon_path, args.runs)
+        print(f"{mode:>9} {result['imports']:>11.1f} {result['first_window']:>16.1f} {result['icon_ready']:>14.1f}")
+
+    medians, first_paint = profile_app(args.runs)
+    print()
+    print(f"{'app.py phase':>18} {'ms':>8}")
+    for name, ms in medians.items():
+        print(f"{name:>18} {ms:>8.1f}")
+
+    # Only script time is budgeted; interpreter start-up is outside the app's control.
+    print()
+    if first_paint > args.budget_ms:
+        print(f"FAIL: first paint after {first_paint:.1f} ms, budget {args.budget_ms:.1f} ms")
+        sys.exit(1)
+    print(f"OK: first paint after {first_paint:.1f} ms, budget {args.budget_ms:.1f} ms")
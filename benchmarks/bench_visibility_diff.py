@@ -0,0 +1,92 @@
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OVERLAYXPERT_PLATFORM", "fake")
+
+from PyQt5.QtWidgets import QApplication
+
+from models.OverlayManager import OverlayManager
+from platforms import getBackend
+from utils.helpers import overlayMatches
+
+OVERLAY_COUNT = 500
+TRANSITIONS = 50
+SWITCHES = 40
+
+
+def make_records():
+    # TRANSITIONS overlays follow game.exe; the rest stay visible ("All") or
+    # belong to processes that are never in front.
+    return [
+        {"id": index + 1, "x": (index * 37) % 1800, "y": (index * 53) % 1000, "width": 120, "height": 80,
+         "process": "game.exe" if index < TRANSITIONS else "All" if index % 2 else f"app{index}.exe"}
+        for index in range(OVERLAY_COUNT)
+    ]
+
+
+class CountingBackend:
+    def __init__(self, backend):
+        self.backend = backend
+        self.batches = 0
+
+    def __call__(self, show, hide):
+        self.batches += 1
+        self.backend.__class__.set_windows_visible(self.backend, show, hide)
+
+
+def per_overlay(manager):
+    # What every tick used to do: ask each window whether it is visible and
+    # show or hide it on its own.
+    snapshot = manager.foreground.refresh()
+    for model in manager.collection:
+        overlay = manager.overlays.get(model.id) or manager.materialize(model)
+        should_show = overlayMatches(model, snapshot)
+        if should_show and not overlay.isVisible():
+            overlay.show()
+        elif not should_show and overlay.isVisible():
+            overlay.hide()
+
+
+def measure(app, mode, check):
+    os.chdir(tempfile.mkdtemp())
+    with open("overlays.json", "w") as file:
+        json.dump(make_records(), file)
+
+    backend = getBackend()
+    backend.add_window(1, 100, "game.exe", title="Game")
+    backend.add_window(2, 101, "other.exe", title="Other")
+    manager = OverlayManager(poll_interval=0, foreground_events=False, render_mode=mode)
+    app.processEvents()
+    counter = backend.set_windows_visible = CountingBackend(backend)
+
+    check(manager)
+    app.processEvents()
+    counter.batches = 0
+    start = time.perf_counter()
+    for switch in range(SWITCHES):
+        backend.set_foreground(1 + switch % 2)
+        check(manager)
+        app.processEvents()
+    elapsed = (time.perf_counter() - start) / SWITCHES * 1000
+
+    manager.close()
+    del backend.set_windows_visible
+    backend.remove_window(1)
+    backend.remove_window(2)
+    return elapsed, counter.batches / SWITCHES
+
+
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+    print(f"{OVERLAY_COUNT} overlays, {TRANSITIONS} change state on every focus switch")
+    print(f"{'mode':>9} {'per-overlay ms':>15} {'diffed ms':>10} {'batches/switch':>15}")
+    for mode in ("window", "composite"):
+        legacy, _ = measure(app, mode, per_overlay)
+        diffed, batches = measure(app, mode, OverlayManager.check_processes)
+        # Composite items never reach the backend; their canvases repaint once per pass.
+        batches = f"{batches:.1f}" if mode == "window" else "-"
+        print(f"{mode:>9} {legacy:>15.2f} {diffed:>10.2f} {batches:>15}")
@@ -0,0 +1,265 @@
+from PyQt5.QtWidgets import (QApplication, QWidget)
+from PyQt5.QtGui import QColor, QCursor, QPainter
+from PyQt5.QtCore import Qt, QRect, QTimer
+from models.OverlayEditor import OverlayEditor
+from models.OverlayPainter import OverlayPainter
+
+from platforms import getBackend
+from utils.helpers import getResizeDirection
+
+RESIZE_CURSORS = {
+    "top-left": Qt.SizeFDiagCursor,
+    "top-right": Qt.SizeBDiagCursor,
+    "bottom-left": Qt.SizeBDiagCursor,
+    "bottom-right": Qt.SizeFDiagCursor,
+    "left": Qt.SizeHorCursor,
+    "right": Qt.SizeHorCursor,
+    "top": Qt.SizeVerCursor,
+    "bottom": Qt.SizeVerCursor,
+}
+
+
+class OverlayItem(OverlayPainter):
+    def __init__(self, compositor, model):
+        self.compositor = compositor
+        self.manager = compositor.manager
+        self.model = model
+        self.init_paint_state()
+        self.bounds = None
+        self.visible = False
+        self.is_editing = False
+        self.resizing = False
+
+    def x(self):
+        return self.model.x + self.origin[0]
+
+    def y(self):
+        return self.model.y + self.origin[1]
+
+    def width(self):
+        return self.model.width
+
+    def height(self):
+        return self.model.height
+
+    def rect(self):
+        return QRect(0, 0, self.model.width, self.model.height)
+
+    def geometry(self):
+        return QRect(*self.screen_geometry())
+
+    def devicePixelRatioF(self):
+        return self.compositor.device_pixel_ratio(self)
+
+    def isVisible(self):
+        return self.visible
+
+    def show(self):
+        self.visible = True
+        self.update()
+
+    def hide(self):
+        self.visible = False
+        self.update()
+
+    def close(self):
+        self.hide()
+        self.compositor.items.pop(self.model.id, None)
+
+    def update(self):
+        # Repaint where the item was last drawn as well as where it is now, so
+        # moves, resizes and hides leave nothing behind.
+        geometry = self.geometry()
+        self.compositor.item_changed(geometry, self.bounds)
+        self.bounds = geometry
+
+    def apply_changes(self, changed):
+        if "color" in changed:
+            self.color = QColor(self.model.color)
+        if "color" in changed or "border" in changed or "width" in changed or "height" in changed:
+            self.paint_cache = None
+        if self.visible:
+            self.update()
+
+    def set_origin(self, origin):
+        if origin != self.origin:
+            self.origin = origin
+            if self.visible:
+                self.update()
+
+    def set_edit_mode(self, is_editing):
+        self.is_editing = is_editing
+
+
+class OverlayCanvas(QWidget):
+    def __init__(self, compositor, screen):
+        super().__init__()
+        self.compositor = compositor
+        self.manager = compositor.manager
+        self.screen_ref = screen
+        self.setGeometry(screen.geometry())
+        self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.Tool | Qt.WindowTransparentForInput)
+        self.setAttribute(Qt.WA_TranslucentBackground)
+        self.setMouseTracking(True)
+        self.active_item = None
+        self.resize_direction = None
+        self.press_pos = None
+        self.press_geometry = None
+
+    def refresh_visibility(self):
+        has_items = any(
+            item.visible and item.geometry().intersects(self.geometry())
+            for item in self.compositor.items.values()
+        )
+        if has_items != self.isVisible():
+            self.setVisible(has_items)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        origin = self.geometry().topLeft()
+        dirty = event.rect().translated(origin)
+        for model in self.manager.collection:
+            item = self.compositor.items.get(model.id)
+            if item is None or not item.visible:
+                continue
+            geometry = item.geometry()
+            if not geometry.intersects(dirty):
+                continue
+            painter.save()
+            painter.translate(geometry.topLeft() - origin)
+            if item.use_pixmap_cache and not item.resizing:
+                painter.drawPixmap(0, 0, item.get_cached_pixmap())
+            else:
+                item.draw_overlay(painter)
+            painter.restore()
+
+    def item_at(self, global_pos):
+        for model in reversed(list(self.manager.collection)):
+            item = self.compositor.items.get(model.id)
+            if item is not None and item.visible and item.geometry().contains(global_pos):
+                return item
+        return None
+
+    def mousePressEvent(self, event):
+        if event.button() != Qt.LeftButton:
+            return
+        item = self.item_at(event.globalPos())
+        if item is None:
+            return
+        self.manager.pause_visibility_updates()
+        local = event.globalPos() - item.geometry().topLeft()
+        self.active_item = item
+        self.resize_direction = getResizeDirection(local.x(), local.y(), item.width(), item.height())
+        item.resizing = self.resize_direction is not None
+        self.press_pos = event.globalPos()
+        self.press_geometry = item.geometry()
+
+    def mouseMoveEvent(self, event):
+        item = self.active_item
+        if item is None:
+            hovered = self.item_at(event.globalPos())
+            if hovered is None:
+                self.setCursor(QCursor(Qt.ArrowCursor))
+                return
+            local = event.globalPos() - hovered.geometry().topLeft()
+            direction = getResizeDirection(local.x(), local.y(), hovered.width(), hovered.height())
+            self.setCursor(QCursor(RESIZE_CURSORS.get(direction, Qt.OpenHandCursor)))
+            return
+
+        delta = event.globalPos() - self.press_pos
+        start = self.press_geometry
+        x, y, width, height = start.x(), start.y(), start.width(), start.height()
+        direction = self.resize_direction
+        bounds = self.manager.screens.bounds()
+        if direction is None:
+            self.setCursor(QCursor(Qt.SizeAllCursor))
+            x = max(bounds.left(), x + delta.x())
+            y = max(bounds.top(), y + delta.y())
+        else:
+            if "left" in direction:
+                width = max(10, start.width() - delta.x())
+                x = max(bounds.left(), start.right() + 1 - width)
+            if "right" in direction:
+                width = max(10, start.width() + delta.x())
+            if "top" in direction:
+                height = max(10, start.height() - delta.y())
+                y = max(bounds.top(), start.bottom() + 1 - height)
+            if "bottom" in direction:
+                height = max(10, start.height() + delta.y())
+        self.manager.place_overlay(item.model, x, y, width, height)
+
+    def mouseReleaseEvent(self, event):
+        if self.active_item is None:
+            return
+        self.active_item.resizing = False
+        self.active_item.update()
+        self.active_item = None
+        self.resize_direction = None
+        self.setCursor(QCursor(Qt.ArrowCursor))
+        self.manager.flush_to_json()
+        self.manager.resume_visibility_updates()
+
+    def mouseDoubleClickEvent(self, event):
+        item = self.item_at(event.globalPos())
+        if item is not None:
+            editor = OverlayEditor(self.manager, item.model)
+            editor.exec_()
+
+
+class OverlayCompositor:
+    def __init__(self, manager):
+        self.manager = manager
+        self.items = {}
+        self.canvases = [OverlayCanvas(self, screen) for screen in QApplication.screens()]
+        self.dirty_canvases = set()
+
+    def create_item(self, model):
+        item = OverlayItem(self, model)
+        self.items[model.id] = item
+        return item
+
+    def canvases_for(self, rect):
+        return [canvas for canvas in self.canvases if canvas.geometry().intersects(rect)]
+
+    def device_pixel_ratio(self, item):
+        canvases = self.canvases_for(item.geometry())
+        return canvases[0].devicePixelRatioF() if canvases else 1.0
+
+    def item_changed(self, geometry, old_geometry=None):
+        for rect in (geometry, old_geometry):
+            if rect is None:
+                continue
+            for canvas in self.canvases_for(rect):
+                canvas.update(rect.translated(-canvas.geometry().topLeft()))
+                if not self.dirty_canvases:
+                    QTimer.singleShot(0, self.refresh_canvases)
+                self.dirty_canvases.add(canvas)
+
+    def refresh_canvases(self):
+        # Whether a host window needs to be shown at all is settled once per
+        # event-loop pass, not once per item that changed.
+        dirty, self.dirty_canvases = self.dirty_canvases, set()
+        for canvas in dirty:
+            canvas.refresh_visibility()
+
+    def refresh_screens(self):
+        # One host per monitor, rebuilt when monitors come, go or change scale.
+        for canvas in self.canvases:
+            canvas.close()
+            canvas.deleteLater()
+        self.canvases = [OverlayCanvas(self, screen) for screen in QApplication.screens()]
+        self.dirty_canvases.clear()
+        getBackend().set_input_transparent(self.canvases, not self.manager.edit_toggle_btn.isChecked())
+        for item in self.items.values():
+            item.bounds = None
+            if item.visible:
+                item.update()
+
+    def set_edit_mode(self, is_editing):
+        for item in self.items.values():
+            item.is_editing = is_editing
+        getBackend().set_input_transparent(self.canvases, not is_editing)
+
+    def close(self):
+        for canvas in self.canvases:
+            canvas.close()
@@ -1,15 +1,12 @@
-from PyQt5.QtWidgets import (QDialog, QPushButton, QVBoxLayout, QComboBox, QSlider, QLabel, QColorDialog, QSpinBox)
+from PyQt5.QtWidgets import (QDialog, QPushButton, QVBoxLayout, QComboBox, QSlider, QLabel, QColorDialog, QSpinBox, QCheckBox, QLineEdit)
 from PyQt5.QtCore import Qt
-import psutil
-import win32gui
-import win32process
+
 
 class OverlayEditor(QDialog):
-    def __init__(self, manager, overlay, data):
+    def __init__(self, manager, model):
         super().__init__(manager)
         self.manager = manager
-        self.overlay = overlay
-        self.data = data
+        self.model = model
 
         self.setWindowTitle("Edit Overlay")
         self.setGeometry(200, 200, 300, 300)
@@ -17,104 +14,165 @@ class OverlayEditor(QDialog):
         layout = QVBoxLayout()
 
         self.x_spin = QSpinBox()
-        self.x_spin.setRange(0, 1920)
-        self.x_spin.setValue(data["x"])
-        self.x_spin.valueChanged.connect(self.update_overlay)
         layout.addWidget(QLabel("X Position:"))
         layout.addWidget(self.x_spin)
 
         self.y_spin = QSpinBox()
-        self.y_spin.setRange(0, 1080)
-        self.y_spin.setValue(data["y"])
-        self.y_spin.valueChanged.connect(self.update_overlay)
         layout.addWidget(QLabel("Y Position:"))
         layout.addWidget(self.y_spin)
 
         self.width_spin = QSpinBox()
-        self.width_spin.setRange(10, 1920)
-        self.width_spin.setValue(data["width"])
-        self.width_spin.valueChanged.connect(self.update_overlay)
         layout.addWidget(QLabel("Width:"))
         layout.addWidget(self.width_spin)
 
         self.height_spin = QSpinBox()
-        self.height_spin.setRange(10, 1080)
-        self.height_spin.setValue(data["height"])
-        self.height_spin.valueChanged.connect(self.update_overlay)
         layout.addWidget(QLabel("Height:"))
         layout.addWidget(self.height_spin)
 
+        self.screen_combo = QComboBox()
+        self.screen_combo.addItem("Primary monitor", "")
+        # The primary is only listed as "", which follows it when another
+        # monitor becomes primary.
+        for name in manager.screens.names():
+            if name and name != manager.screens.primary:
+                self.screen_combo.addItem(name, name)
+        if self.screen_combo.findData(model.screen) < 0:
+            connected = model.screen in manager.screens.screens
+            self.screen_combo.addItem(model.screen if connected else f"{model.screen} (disconnected)", model.screen)
+        self.screen_combo.setCurrentIndex(self.screen_combo.findData(model.screen))
+        self.screen_combo.currentIndexChanged.connect(self.update_screen)
+        layout.addWidget(QLabel("Monitor:"))
+        layout.addWidget(self.screen_combo)
+
+        # Ranges come from the monitors actually connected, so they are set
+        # before the values they would otherwise clamp.
+        self.update_position_ranges()
+        for spin, value in ((self.x_spin, model.x), (self.y_spin, model.y), (self.width_spin, model.width), (self.height_spin, model.height)):
+            spin.setValue(value)
+            spin.valueChanged.connect(self.update_overlay)
+
         self.opacity_slider = QSlider(Qt.Horizontal)
         self.opacity_slider.setRange(0, 100)
-        self.opacity_slider.setValue(int(overlay.opacity * 100))
+        self.opacity_slider.setValue(int(model.opacity * 100))
         self.opacity_slider.valueChanged.connect(self.update_opacity)
         layout.addWidget(QLabel("Opacity:"))
         layout.addWidget(self.opacity_slider)
 
         self.process_combo = QComboBox()
+        # Besides a listed process, a rule may be typed: "a.exe, b.exe", "game*.exe" or "re:^steam".
+        self.process_combo.setEditable(True)
+        self.process_combo.setInsertPolicy(QComboBox.NoInsert)
         self.process_combo.addItem("All")
-        self.process_combo.addItems(self.get_process_list())
-        self.process_combo.setCurrentText(data.get("process", "All"))
-        self.process_combo.currentTextChanged.connect(self.update_process)
+        if model.process != "All":
+            self.process_combo.addItem(model.process)
+        self.known_processes = {"All", model.process}
+        self.add_processes(manager.processes.process_names())
+        self.process_combo.setCurrentText(model.process)
+        self.process_combo.activated[str].connect(self.update_process)
+        self.process_combo.lineEdit().editingFinished.connect(lambda: self.update_process(self.process_combo.currentText()))
         layout.addWidget(QLabel("Restricted Process:"))
         layout.addWidget(self.process_combo)
 
+        self.anchor_check = QCheckBox("Follow the process window (position relative to it)")
+        self.anchor_check.setChecked(model.anchor)
+        self.anchor_check.toggled.connect(self.update_anchor)
+        layout.addWidget(self.anchor_check)
+
+        self.title_edit = QLineEdit(model.target_title)
+        self.title_edit.setPlaceholderText("any title")
+        self.title_edit.editingFinished.connect(self.update_target)
+        layout.addWidget(QLabel("Window Title Contains:"))
+        layout.addWidget(self.title_edit)
+
+        self.class_edit = QLineEdit(model.target_class)
+        self.class_edit.setPlaceholderText("any class")
+        self.class_edit.editingFinished.connect(self.update_target)
+        layout.addWidget(QLabel("Window Class:"))
+        layout.addWidget(self.class_edit)
+
+        self.schedule_edit = QLineEdit(model.schedule)
+        self.schedule_edit.setPlaceholderText("always, or e.g. 18:00-23:30")
+        self.schedule_edit.editingFinished.connect(self.update_schedule)
+        layout.addWidget(QLabel("Active Hours:"))
+        layout.addWidget(self.schedule_edit)
+
         self.color_btn = QPushButton("Choose Color")
         self.color_btn.clicked.connect(self.choose_color)
         layout.addWidget(self.color_btn)
 
         self.setLayout(layout)
 
+        # The list shows what the shared registry already knows and grows as it
+        # picks up windows opened since the last scan.
+        manager.processes.changed.connect(self.on_processes_changed)
+        manager.processes.refresh()
+
+    def add_processes(self, names):
+        names = [name for name in names if name not in self.known_processes]
+        self.known_processes.update(names)
+        self.process_combo.addItems(names)
+
+    def on_processes_changed(self, added, removed):
+        self.add_processes(added)
+
+    def done(self, result):
+        self.manager.processes.changed.disconnect(self.on_processes_changed)
+        super().done(result)
+
     def update_overlay(self):
-        self.data["x"] = self.x_spin.value()
-        self.data["y"] = self.y_spin.value()
-        self.data["width"] = self.width_spin.value()
-        self.data["height"] = self.height_spin.value()
-        self.overlay.setGeometry(
-            self.data["x"], self.data["y"], self.data["width"], self.data["height"]
+        self.manager.collection.update(
+            self.model,
+            x=self.x_spin.value(),
+            y=self.y_spin.value(),
+            width=self.width_spin.value(),
+            height=self.height_spin.value(),
         )
-        self.manager.save_to_json()
+
+    def update_position_ranges(self):
+        # Positions are relative to the overlay's monitor, or to its window when
+        # anchored, and may reach anywhere on the virtual desktop.
+        bounds = self.manager.screens.bounds()
+        if self.model.anchor:
+            self.x_spin.setRange(-bounds.width(), bounds.width())
+            self.y_spin.setRange(-bounds.height(), bounds.height())
+        else:
+            origin_x, origin_y = self.manager.screens.origin(self.model.screen)
+            self.x_spin.setRange(bounds.left() - origin_x, bounds.right() - origin_x)
+            self.y_spin.setRange(bounds.top() - origin_y, bounds.bottom() - origin_y)
+        self.width_spin.setRange(10, bounds.width())
+        self.height_spin.setRange(10, bounds.height())
+        self.screen_combo.setEnabled(not self.model.anchor)
+
+    def update_anchor(self, anchor):
+        # The overlay keeps its place on screen; only the reference point changes.
+        old_x, old_y = self.manager.anchors.origin(self.model)
+        self.manager.collection.update(self.model, anchor=anchor)
+        new_x, new_y = self.manager.anchors.origin(self.model)
+        self.update_position_ranges()
+        self.x_spin.setValue(self.model.x + old_x - new_x)
+        self.y_spin.setValue(self.model.y + old_y - new_y)
+
+    def update_screen(self, index):
+        # The overlay keeps its offset and moves to the same spot on the other monitor.
+        self.manager.collection.update(self.model, screen=self.screen_combo.itemData(index))
+        self.update_position_ranges()
+
+    def update_target(self):
+        self.manager.collection.update(
+            self.model, target_title=self.title_edit.text(), target_class=self.class_edit.text()
+        )
+
+    def update_schedule(self):
+        self.manager.collection.update(self.model, schedule=self.schedule_edit.text().strip())
 
     def update_opacity(self, value):
-        opacity = value / 100.0
-        self.data["opacity"] = opacity
-        self.overlay.set_opacity(opacity)
-        self.manager.save_to_json()
+        self.manager.collection.update(self.model, opacity=value / 100.0)
 
     def update_process(self, process_name):
-        self.data["process"] = process_name
-        self.manager.update_overlay_row(self.overlay, process_name)  
-        self.overlay.process = process_name
-        self.manager.save_to_json()
+        self.manager.collection.update(self.model, process=process_name.strip() or "All")
 
     def choose_color(self):
         color = QColorDialog.getColor()
         if color.isValid():
-            self.data["color"] = color.name()
-            self.overlay.color = color
-            self.overlay.update()
-            self.manager.save_to_json()
-
-    def get_process_list(self):
-        def is_window_visible(hwnd):
-            return win32gui.IsWindowVisible(hwnd) and win32gui.GetWindowText(hwnd)
-
-        visible_windows = []
-        win32gui.EnumWindows(
-            lambda hwnd, _: visible_windows.append(hwnd)
-            if is_window_visible(hwnd)
-            else None,
-            None,
-        )
-
-        visible_pids = set()
-        for hwnd in visible_windows:
-            _, pid = win32process.GetWindowThreadProcessId(hwnd)
-            visible_pids.add(pid)
-
-        processes = []
-        for p in psutil.process_iter(["pid", "name"]):
-            if p.info["pid"] in visible_pids:
-                processes.append(p.info["name"])
+            self.manager.collection.update(self.model, color=color.name())
 
-        return list(set(processes))
@@ -1,29 +1,98 @@
 import json
-from PyQt5.QtWidgets import (QMainWindow, QWidget, QPushButton, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem)
-from PyQt5.QtGui import QColor, QIcon
-from PyQt5.QtCore import Qt, QTimer
+import time
+from contextlib import contextmanager
+
+from PyQt5.QtWidgets import (QMainWindow, QWidget, QPushButton, QVBoxLayout, QHBoxLayout, QTableView, QAbstractItemView, QHeaderView, QFileDialog)
+from PyQt5.QtCore import QTimer, pyqtSignal
+from models.OverlayCanvas import OverlayCompositor
 from models.OverlayEditor import OverlayEditor
+from models.OverlayModel import OverlayCollection, OverlayModel
+from models.OverlayTableModel import TOGGLE_COLUMN, OverlayTableModel, ToggleButtonDelegate
 from models.OverlayWidget import OverlayWidget
-from resources import *
 
-from utils.helpers import shouldShowOverlay
+from utils.foreground import ForegroundService
+from platforms import getBackend
+from utils.persistence import LAYOUT_FORMAT, OverlayStore, parseLayout
+from utils.process_registry import VisibleProcessRegistry
+from utils.rules import VisibilityRules
+from utils.screens import ScreenTable
+from utils.startup_profile import StartupProfiler
+from utils.window_anchors import WindowAnchors
+
+ANCHOR_FIELDS = ("anchor", "process", "target_title", "target_class")
+RULE_FIELDS = ("active", "process", "target_title", "target_class", "schedule")
 
 class OverlayManager(QMainWindow):
-    def __init__(self):
+    first_painted = pyqtSignal()
+
+    def __init__(self, poll_interval=1000, foreground_events=True, event_source=None, render_mode="window", profiler=None, release_after=0):
         super().__init__()
+        self.profiler = profiler or StartupProfiler()
+        self.painted = False
         self.setWindowTitle("OverlayXpert - Oppai [0.0.5]")
         self.setGeometry(100, 100, 600, 400)
 
-        self.overlays = []
-        self.overlay_data = []
+        self.collection = OverlayCollection()
+        self.collection.subscribe(self.on_overlay_event)
+        # Only overlays that have matched their process rule at least once get a
+        # native window (or composite item); the rest exist only in the collection.
+        self.overlays = {}
+        self.hidden_since = {}
+        # Ids of the overlays last made visible: the state new visibility is diffed against.
+        self.shown = set()
+        self.pending_visibility = None
+        self.compositor = OverlayCompositor(self) if render_mode == "composite" else None
         self.editors = []
+        self.store = OverlayStore()
+        self.processes = VisibleProcessRegistry(parent=self, title_filter=self.title_matters)
+        self.foreground = ForegroundService(registry=self.processes)
+        self.screens = ScreenTable(self)
+        self.screens.changed.connect(self.on_screens_changed)
+        self.anchors = WindowAnchors(self)
+        self.rules = VisibilityRules()
+        # Re-evaluates time-of-day rules when one of their ranges starts or ends.
+        self.schedule_timer = QTimer(self)
+        self.schedule_timer.setSingleShot(True)
+        self.schedule_timer.timeout.connect(self.schedule_boundary)
+        self.processes.windows_changed.connect(self.on_windows_changed)
+        self.applied_snapshot = None
+        self.visibility_paused = False
+
+        self.profiler.mark("manager_setup")
 
         self.initUI()
+        self.profiler.mark("init_ui")
         self.load_from_json()
+        self.profiler.mark("load_from_json")
+        self.processes.start(foreground_events)
+
+        self.foreground_events = None
+        if foreground_events:
+            source = event_source if event_source is not None else getBackend().create_foreground_event_source(self)
+            if source is not None and source.start():
+                source.changed.connect(self.check_processes)
+                self.foreground_events = source
 
+        # Polling is only the fallback when no foreground event source is available.
         self.timer = QTimer(self)
+        self.timer.setInterval(poll_interval)
         self.timer.timeout.connect(self.check_processes)
-        self.timer.start(1000)
+        if self.foreground_events is None and poll_interval > 0:
+            self.timer.start()
+        self.profiler.mark("foreground_events")
+
+        self.release_after = release_after
+        self.release_timer = QTimer(self)
+        self.release_timer.timeout.connect(self.release_idle_overlays)
+        if release_after > 0:
+            self.release_timer.start(int(min(60, release_after / 2) * 1000))
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.painted:
+            self.painted = True
+            # Announced from the event loop rather than from inside the paint.
+            QTimer.singleShot(0, self.first_painted.emit)
 
     def initUI(self):
         central_widget = QWidget()
@@ -31,12 +100,20 @@ class OverlayManager(QMainWindow):
 
         layout = QVBoxLayout()
 
-        self.overlay_table = QTableWidget(0, 5)
-        self.overlay_table.setHorizontalHeaderLabels(["ID", "App", "Process", "Status", "Active"])
+        self.table_model = OverlayTableModel(self.collection, self.processes, self)
+        self.toggle_delegate = ToggleButtonDelegate(self)
+        self.toggle_delegate.clicked.connect(self.toggle_overlay_row)
+
+        self.overlay_table = QTableView()
+        self.overlay_table.setModel(self.table_model)
+        self.overlay_table.setItemDelegateForColumn(TOGGLE_COLUMN, self.toggle_delegate)
         self.overlay_table.horizontalHeader().setSectionsClickable(False)
-        self.overlay_table.setEditTriggers(QTableWidget.NoEditTriggers)
-        self.overlay_table.cellDoubleClicked.connect(self.open_editor)
+        self.overlay_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.overlay_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.overlay_table.doubleClicked.connect(lambda index: self.open_editor(index.row(), index.column()))
         self.overlay_table.verticalHeader().setVisible(False)
+        # Fixed row heights let the view lay out thousands of rows without measuring each one.
+        self.overlay_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
         layout.addWidget(self.overlay_table)
 
         controls_layout = QHBoxLayout()
@@ -44,6 +121,10 @@ class OverlayManager(QMainWindow):
         add_overlay_btn.clicked.connect(self.add_overlay)
         controls_layout.addWidget(add_overlay_btn)
 
+        import_overlays_btn = QPushButton("Import Overlays")
+        import_overlays_btn.clicked.connect(lambda: self.import_overlays())
+        controls_layout.addWidget(import_overlays_btn)
+
         delete_overlay_btn = QPushButton("Delete Overlay")
         delete_overlay_btn.clicked.connect(self.delete_overlay)
         controls_layout.addWidget(delete_overlay_btn)
@@ -58,64 +139,44 @@ class OverlayManager(QMainWindow):
         central_widget.setLayout(layout)
 
     def open_editor(self, row, column):
-        if row < 0 or row >= len(self.overlays):  
+        if row < 0 or row >= len(self.collection) or column == TOGGLE_COLUMN:
             return  
 
-        overlay = self.overlays[row]
-        data = self.overlay_data[row]
-        editor = OverlayEditor(self, overlay, data)
+        editor = OverlayEditor(self, self.collection[row])
         editor.exec_()
         self.editors.append(editor)
 
     def add_overlay(self):
-        overlay = OverlayWidget(self)
-        overlay.show()
-
-        self.overlays.append(overlay)
-        overlay_data = {
-            "x": overlay.x(),
-            "y": overlay.y(),
-            "width": overlay.width(),
-            "height": overlay.height(),
-            "color": overlay.color.name(),
-            "border": overlay.border,
-            "opacity": overlay.opacity,
-            "process": "All",
-            "active": True,
-        }
-        self.overlay_data.append(overlay_data)
-
-        self.save_to_json()
-        
-        row = self.overlay_table.rowCount()
-        self.overlay_table.insertRow(row)
-        self.overlay_table.setItem(row, 0, QTableWidgetItem(str(len(self.overlays))))
-        
-        self.overlay_table.setItem(row, 1, QTableWidgetItem("Overlay"))
-        self.overlay_table.setItem(row, 2, QTableWidgetItem(overlay.process))
-
-        status_item = QTableWidgetItem("Active" if overlay_data.get("active", True) else "Disabled")
-        status_item.setTextAlignment(Qt.AlignCenter)
-        status_item.setForeground(Qt.green if overlay_data.get("active", True) else Qt.red)
-        self.overlay_table.setItem(row, 3, status_item)
-
-        toggle_btn = QPushButton("Toggle")
-        toggle_btn.clicked.connect(lambda _, r=row: self.toggle_overlay_status(r))
-        self.overlay_table.setCellWidget(row, 4, toggle_btn)
-
-        is_editing = self.edit_toggle_btn.isChecked()
-        for overlay in self.overlays:
-            overlay.set_edit_mode(is_editing)
+        self.collection.add(OverlayModel())
+
+    def add_overlays(self, models):
+        with self.collection.batch():
+            for model in models:
+                self.collection.add(model)
+
+    def import_overlays(self, path=None):
+        if path is None:
+            path, _ = QFileDialog.getOpenFileName(self, "Import Overlays", "", "JSON files (*.json)")
+            if not path:
+                return
+        try:
+            with open(path, "r") as file:
+                records, layout_format = parseLayout(json.load(file))
+        except (OSError, json.JSONDecodeError) as error:
+            print("Failed to import overlays:", error)
+            return
+        if layout_format < LAYOUT_FORMAT:
+            for record in records:
+                self.upgrade_record(record)
+
+        # Imported overlays always get fresh ids so they never collide with existing ones.
+        self.add_overlays(OverlayModel.from_dict(dict(record, id=None)) for record in records)
 
     def delete_overlay(self):
-        selected_row = self.overlay_table.currentRow()
-        if selected_row >= 0:
-            overlay = self.overlays[selected_row]
-            overlay.close()
-            self.overlays.pop(selected_row)
-            self.overlay_data.pop(selected_row)
-            self.overlay_table.removeRow(selected_row)
-            self.save_to_json()
+        rows = {index.row() for index in self.overlay_table.selectionModel().selectedRows()}
+        if not rows and self.overlay_table.currentIndex().isValid():
+            rows = {self.overlay_table.currentIndex().row()}
+        self.collection.remove_many([self.collection[row].id for row in rows])
 
     def toggle_edit_mode(self):
         is_editing = self.edit_toggle_btn.isChecked()
@@ -125,89 +186,284 @@ class OverlayManager(QMainWindow):
         else:
             self.edit_toggle_btn.setText("Editing Mode: OFF")
             self.edit_toggle_btn.setStyleSheet("color: red; font-weight: bold;")
-        for overlay in self.overlays:
-            overlay.set_edit_mode(is_editing)
+        if self.compositor is not None:
+            self.compositor.set_edit_mode(is_editing)
+            return
+
+        # One pass over every overlay window, flipping input transparency in place.
+        for overlay in self.overlays.values():
+            overlay.is_editing = is_editing
+        getBackend().set_input_transparent(self.overlays.values(), not is_editing)
+
+    def create_overlay(self, model):
+        if self.compositor is not None:
+            return self.compositor.create_item(model)
+        return OverlayWidget(self, model)
 
-    def save_to_json(self):
-        with open("overlays.json", "w") as file:
-            json.dump(self.overlay_data, file, indent=4)
+    def flush_to_json(self):
+        self.store.flush()
 
     def load_from_json(self):
         try:
-            with open("overlays.json", "r") as file:
-                self.overlay_data = json.load(file)
-
-            self.overlay_table.setRowCount(0)
+            records = self.store.load(upgrade=self.upgrade_record)
+        except OSError as error:
+            print("Failed to load overlays:", error)
+            return
+
+        self.collection.reset(OverlayModel.from_dict(data) for data in records)
+        print("Overlays loaded:", len(self.collection))  
+
+    def on_overlay_event(self, event, model, changed):
+        if event == "batch":
+            with self.deferred_visibility():
+                for event, model, changed in changed:
+                    self.on_overlay_event(event, model, changed)
+
+        elif event == "reset":
+            for overlay in self.overlays.values():
+                overlay.close()
             self.overlays.clear()
-
-            for index, data in enumerate(self.overlay_data):
-                overlay = OverlayWidget(
-                    self,
-                    x=data["x"],
-                    y=data["y"],
-                    width=data["width"],
-                    height=data["height"],
-                    color=QColor(data["color"]),
-                    border=data["border"],
-                    opacity=data.get("opacity", 1.0),
-                    process=data.get("process", "All"),
-                    active=data.get("active", True)
-                )
-
-                self.overlays.append(overlay)  
-
-                shouldShowOverlay(overlay)
-
-                row = self.overlay_table.rowCount()
-                self.overlay_table.insertRow(row)
-                self.overlay_table.setItem(row, 0, QTableWidgetItem(str(index + 1)))  
-                self.overlay_table.setItem(row, 1, QTableWidgetItem("Overlay"))
-                self.overlay_table.setItem(row, 2, QTableWidgetItem(overlay.process))
-
-                status_item = QTableWidgetItem("Active" if data.get("active", True) else "Disabled")
-                status_item.setTextAlignment(Qt.AlignCenter)
-                status_item.setForeground(Qt.green if data.get("active", True) else Qt.red)
-                self.overlay_table.setItem(row, 3, status_item)
-
-                toggle_btn = QPushButton("Toggle")
-                toggle_btn.clicked.connect(lambda _, r=row: self.toggle_overlay_status(r))
-                self.overlay_table.setCellWidget(row, 4, toggle_btn)
-
-            print("Overlays loaded:", len(self.overlays))  
-
-        except (FileNotFoundError, json.JSONDecodeError):
-            print("JSON file not found or corrupt!")
-
-    def toggle_overlay_status(self, row):
-        overlay = self.overlays[row]
-        overlay.set_active(not overlay.active)  
-
-        status_item = self.overlay_table.item(row, 3)
-        status_item.setText("Active" if overlay.active else "Disabled")
-        status_item.setForeground(Qt.green if overlay.active else Qt.red)
-
-        self.save_to_json()
+            self.hidden_since.clear()
+            self.shown.clear()
+            self.anchors.clear()
+            self.rules.rebuild(self.collection)
+            snapshot = self.foreground.refresh()
+            self.applied_snapshot = snapshot
+            visible = self.rules.matching(snapshot)
+            for model in self.collection:
+                if model.anchor:
+                    self.anchors.bind(model)
+            self.update_visibility((model, model.id in visible) for model in self.collection)
+            self.schedule_rules()
+
+        elif event == "added":
+            # A new overlay follows its process rule like a loaded one; the default
+            # "All" rule shows it right away.
+            self.rules.add(model)
+            if model.anchor:
+                self.anchors.bind(model)
+            self.apply_visibility(model, self.rules.matches(model, self.foreground.snapshot))
+            self.store.add(model.to_dict())
+            if model.schedule:
+                self.schedule_rules()
+
+        elif event == "removed":
+            overlay = self.overlays.pop(model.id, None)
+            if overlay is not None:
+                overlay.close()
+            self.hidden_since.pop(model.id, None)
+            self.shown.discard(model.id)
+            self.anchors.forget(model.id)
+            self.rules.remove(model.id)
+            self.store.remove(model.id)
+
+        elif event == "changed":
+            overlay = self.overlays.get(model.id)
+            if overlay is not None:
+                if "screen" in changed:
+                    overlay.set_origin(self.anchors.origin(model))
+                overlay.apply_changes(changed)
+            rule_changed = any(name in changed for name in RULE_FIELDS)
+            if rule_changed:
+                self.rules.update(model)
+            rebound = any(name in changed for name in ANCHOR_FIELDS) and self.anchors.bind(model)
+            if rebound or rule_changed:
+                self.apply_visibility(model, self.rules.matches(model, self.foreground.snapshot))
+            self.store.update(model.id, changed)
+            if "schedule" in changed:
+                self.schedule_rules()
+
+    def materialize(self, model):
+        overlay = self.create_overlay(model)
+        overlay.set_edit_mode(self.edit_toggle_btn.isChecked())
+        overlay.set_origin(self.anchors.origin(model))
+        self.overlays[model.id] = overlay
+        return overlay
+
+    def apply_visibility(self, model, matches):
+        if self.pending_visibility is not None:
+            self.pending_visibility[model.id] = (model, matches)
+        else:
+            self.update_visibility([(model, matches)])
+
+    @contextmanager
+    def deferred_visibility(self):
+        # Visibility decided inside the block is applied in one pass at its end.
+        if self.pending_visibility is not None:
+            yield
+            return
+        self.pending_visibility = {}
+        try:
+            yield
+        finally:
+            pending, self.pending_visibility = self.pending_visibility, None
+            self.update_visibility(pending.values())
+
+    def update_visibility(self, changes):
+        # The desired state is diffed against the last one applied rather than
+        # against isVisible(), and only the transitions reach the windows.
+        show, hide = [], []
+        now = time.monotonic()
+        for model, matches in changes:
+            # An anchored overlay stays hidden until a matching window is there to place it against.
+            visible = matches and self.anchors.is_placed(model)
+            if visible == (model.id in self.shown):
+                continue
+            if visible:
+                overlay = self.overlays.get(model.id) or self.materialize(model)
+                self.shown.add(model.id)
+                self.hidden_since.pop(model.id, None)
+                show.append(overlay)
+            else:
+                self.shown.discard(model.id)
+                overlay = self.overlays.get(model.id)
+                if overlay is not None:
+                    self.hidden_since[model.id] = now
+                    hide.append(overlay)
+        if show or hide:
+            self.set_overlays_visible(show, hide)
+
+    def set_overlays_visible(self, show, hide):
+        if self.compositor is not None:
+            # Items only mark regions dirty; the canvases repaint once afterwards.
+            for item in hide:
+                item.hide()
+            for item in show:
+                item.show()
+            return
+        getBackend().set_windows_visible(show, hide)
+
+    def release_idle_overlays(self):
+        cutoff = time.monotonic() - self.release_after
+        for overlay_id in [overlay_id for overlay_id, since in self.hidden_since.items() if since <= cutoff]:
+            del self.hidden_since[overlay_id]
+            self.overlays.pop(overlay_id).close()
+
+    def toggle_overlay_row(self, row):
+        # The delegate reports the row at click time, so it is always current.
+        self.toggle_overlay_status(self.collection[row].id)
+
+    def toggle_overlay_status(self, overlay_id):
+        model = self.collection.get(overlay_id)
+        self.collection.update(model, active=not model.active)
 
     def check_processes(self):
-        for i, overlay in enumerate(self.overlays):
-            shouldShowOverlay(overlay)
+        if self.visibility_paused:
+            return
+        snapshot = self.foreground.refresh()
+        previous = self.applied_snapshot
+        if snapshot is previous:
+            self.refresh_window_rules()
+            return
+        self.applied_snapshot = snapshot
+        rebound = self.anchors.rebind_all() if self.anchors.anchored else []
+        if previous is None:
+            visible = self.rules.matching(snapshot)
+            self.update_visibility((model, model.id in visible) for model in self.collection)
+            return
+        # Only overlays indexed under the process that lost or gained focus can
+        # change state; the cost does not grow with the total overlay count.
+        affected = self.rules.affected(previous.process) | self.rules.affected(snapshot.process)
+        affected.update(model.id for model in rebound)
+        visible = self.rules.filter(affected, snapshot)
+        self.update_visibility((self.collection.get(overlay_id), overlay_id in visible) for overlay_id in affected)
+
+    def title_matters(self, window):
+        # Title rules only look at the window in front, anchors at their targets.
+        return window == self.foreground.snapshot.hwnd or window in self.anchors.targets
+
+    def on_windows_changed(self):
+        self.rebind_anchors()
+        self.refresh_window_rules()
+
+    def refresh_window_rules(self):
+        # Same window in front, but its title may have changed ("Lobby" to
+        # "Match"); only overlays with title, class or time conditions are re-checked.
+        snapshot = self.applied_snapshot
+        if snapshot is None or self.visibility_paused or not self.rules.window_changed(snapshot):
+            return
+        constrained = self.rules.constrained
+        visible = self.rules.filter(constrained, snapshot)
+        self.update_visibility((self.collection.get(overlay_id), overlay_id in visible) for overlay_id in constrained)
+
+    def rebind_anchors(self):
+        snapshot = self.foreground.snapshot
+        self.update_visibility((model, self.rules.matches(model, snapshot)) for model in self.anchors.rebind_all())
+
+    def schedule_rules(self):
+        seconds = self.rules.seconds_to_next_boundary()
+        if seconds is None:
+            self.schedule_timer.stop()
+        else:
+            self.schedule_timer.start(int(seconds * 1000) + 500)
+
+    def schedule_boundary(self):
+        # The foreground has not changed, so the last snapshot is applied again.
+        self.applied_snapshot = None
+        self.check_processes()
+        self.schedule_rules()
+
+    def pause_visibility_updates(self):
+        self.visibility_paused = True
+        self.timer.stop()
+
+    def resume_visibility_updates(self):
+        self.visibility_paused = False
+        if self.foreground_events is None and self.timer.interval() > 0:
+            self.timer.start()
+        self.check_processes()
+
+    def closeEvent(self, event):
+        if self.foreground_events is not None:
+            self.foreground_events.stop()
+        self.processes.stop()
+        self.anchors.stop()
+        self.store.close()
+        if self.compositor is not None:
+            self.compositor.close()
+        super().closeEvent(event)
+
+    def on_screens_changed(self):
+        if self.compositor is not None:
+            self.compositor.refresh_screens()
+        self.anchors.refresh_origins()
+        for overlay_id in self.overlays:
+            self.anchors.place(overlay_id)
 
     def update_overlay_data(self, overlay):
-        index = self.overlays.index(overlay)
-        self.overlay_data[index] = {
-            "x": overlay.x(),
-            "y": overlay.y(),
-            "width": overlay.width(),
-            "height": overlay.height(),
-            "color": overlay.color.name(),
-            "border": overlay.border,
-            "process": overlay.process,
-            "opacity": overlay.opacity,
-            "active": overlay.active
-        }
-        self.save_to_json()
-
-    def update_overlay_row(self, overlay, process_name):
-        if overlay in self.overlays:
-            index = self.overlays.index(overlay)
-            self.overlay_table.setItem(index, 2, QTableWidgetItem(process_name))
+        self.place_overlay(overlay.model, overlay.x(), overlay.y(), overlay.width(), overlay.height())
+
+    def upgrade_record(self, record):
+        # Layouts saved before HiDPI support hold device pixels: absolute on the
+        # desktop, or offsets from the target window for anchored overlays.
+        # Records that already name a monitor were written in logical pixels.
+        if "screen" in record:
+            return
+        x, y = record.get("x", 0), record.get("y", 0)
+        screen = "" if record.get("anchor") else self.screens.device_screen(x, y)
+        if screen is None or screen == self.screens.primary:
+            screen = ""
+        ratio = self.screens.ratio(screen)
+        origin_x, origin_y = (0, 0) if record.get("anchor") else self.screens.origin(screen)
+        record["screen"] = screen
+        record["x"] = round((x - origin_x) / ratio)
+        record["y"] = round((y - origin_y) / ratio)
+        for name in ("width", "height"):
+            if name in record:
+                record[name] = round(record[name] / ratio)
+
+    def place_overlay(self, model, x, y, width, height):
+        # x and y are global. An unanchored overlay moves to the monitor its
+        # centre is on and is stored relative to that monitor.
+        screen = model.screen
+        if not model.anchor:
+            screen = self.screens.screen_at(x + width // 2, y + height // 2)
+            if screen is None or self.screens.geometry(screen) == self.screens.geometry(model.screen):
+                screen = model.screen
+        if screen != model.screen:
+            origin_x, origin_y = self.screens.origin(screen)
+        else:
+            origin_x, origin_y = self.anchors.origin(model)
+        self.collection.update(
+            model, screen=screen, x=x - origin_x, y=y - origin_y, width=width, height=height
+        )
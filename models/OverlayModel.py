@@ -0,0 +1,152 @@
+from contextlib import contextmanager
+
+FIELDS = (
+    "x", "y", "width", "height", "color", "border", "opacity", "process", "active",
+    "anchor", "target_title", "target_class", "schedule", "screen",
+)
+
+DEFAULTS = {
+    "x": 0,
+    "y": 0,
+    "width": 100,
+    "height": 100,
+    "color": "#000000",
+    "border": 0,
+    "opacity": 1.0,
+    "process": "All",
+    "active": True,
+    # process, target_title and target_class are rules (see utils/rules.py):
+    # comma-separated alternatives, each a name, a wildcard or a "re:" regex.
+    # Anchored overlays keep x/y relative to the client area of the matching
+    # window.
+    "anchor": False,
+    "target_title": "",
+    "target_class": "",
+    # Times of day the overlay may show, e.g. "18:00-23:30"; empty for always.
+    "schedule": "",
+    # Unanchored overlays keep x/y relative to this monitor, in device-independent
+    # pixels; "" is the primary monitor.
+    "screen": "",
+}
+
+
+class OverlayModel:
+    __slots__ = ("id",) + FIELDS
+
+    def __init__(self, id=None, **fields):
+        self.id = id
+        for name in FIELDS:
+            setattr(self, name, fields.get(name, DEFAULTS[name]))
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data.get("id"), **{name: data[name] for name in FIELDS if name in data})
+
+    def to_dict(self):
+        data = {name: getattr(self, name) for name in FIELDS}
+        data["id"] = self.id
+        return data
+
+    def geometry(self):
+        return self.x, self.y, self.width, self.height
+
+
+class OverlayCollection:
+    def __init__(self):
+        self._models = []
+        self._by_id = {}
+        self._rows = {}
+        self._listeners = []
+        self._batch_depth = 0
+        self._batched = []
+        self.next_id = 1
+
+    def __len__(self):
+        return len(self._models)
+
+    def __iter__(self):
+        return iter(self._models)
+
+    def __getitem__(self, row):
+        return self._models[row]
+
+    def get(self, overlay_id):
+        return self._by_id.get(overlay_id)
+
+    def row(self, overlay_id):
+        return self._rows.get(overlay_id)
+
+    def subscribe(self, listener):
+        self._listeners.append(listener)
+
+    def _notify(self, event, model, changed=None):
+        if self._batch_depth:
+            self._batched.append((event, model, changed))
+            return
+        for listener in self._listeners:
+            listener(event, model, changed)
+
+    @contextmanager
+    def batch(self):
+        # Events raised inside the block are held back and delivered as one
+        # "batch" event whose payload is the list of (event, model, changed).
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._batched:
+                events, self._batched = self._batched, []
+                self._notify("batch", None, events)
+
+    def reset(self, models):
+        self._models = list(models)
+        self._by_id = {model.id: model for model in self._models}
+        self._rows = {model.id: row for row, model in enumerate(self._models)}
+        self.next_id = max(self._by_id, default=0) + 1
+        self._notify("reset", None)
+
+    def add(self, model):
+        if model.id is None:
+            model.id = self.next_id
+        self.next_id = max(self.next_id, model.id + 1)
+        self._rows[model.id] = len(self._models)
+        self._by_id[model.id] = model
+        self._models.append(model)
+        self._notify("added", model)
+        return model
+
+    def remove(self, overlay_id):
+        row = self._rows.pop(overlay_id)
+        model = self._by_id.pop(overlay_id)
+        del self._models[row]
+        for index in range(row, len(self._models)):
+            self._rows[self._models[index].id] = index
+        self._notify("removed", model, {"row": row})
+        return model
+
+    def remove_many(self, overlay_ids):
+        # The rows are re-indexed once for the whole set. Removals are announced
+        # bottom-up, so each reported row is right for the removals before it.
+        rows = sorted((self._rows[overlay_id] for overlay_id in set(overlay_ids)), reverse=True)
+        removed = [self._models[row] for row in rows]
+        for model in removed:
+            del self._rows[model.id]
+            del self._by_id[model.id]
+        self._models = [model for model in self._models if model.id in self._by_id]
+        self._rows = {model.id: row for row, model in enumerate(self._models)}
+        with self.batch():
+            for row, model in zip(rows, removed):
+                self._notify("removed", model, {"row": row})
+        return removed
+
+    def update(self, model, **fields):
+        # Only fields whose value actually changed are applied and announced, so
+        # listeners re-render and re-persist exactly what is dirty.
+        changed = {name: value for name, value in fields.items() if getattr(model, name) != value}
+        if not changed:
+            return changed
+        for name, value in changed.items():
+            setattr(model, name, value)
+        self._notify("changed", model, changed)
+        return changed
@@ -0,0 +1,100 @@
+from PyQt5.QtGui import QColor, QPainter, QPen, QBrush, QFont, QFontMetrics, QPixmap, QPixmapCache
+from PyQt5.QtCore import Qt
+
+PIXMAP_CACHE_LIMIT_KB = 32 * 1024
+
+class OverlayPainter:
+    label_font = None
+    use_pixmap_cache = True
+    pixmap_cache_ready = False
+    origin = (0, 0)
+
+    def init_paint_state(self):
+        self.color = QColor(self.model.color)
+        self.paint_cache = None
+        self.pixmap_key = None
+
+    @property
+    def overlay_id(self):
+        return self.model.id
+
+    @property
+    def border(self):
+        return self.model.border
+
+    @property
+    def opacity(self):
+        return self.model.opacity
+
+    def screen_geometry(self):
+        # origin is the top-left of the window an anchored overlay follows.
+        x, y = self.origin
+        return self.model.x + x, self.model.y + y, self.model.width, self.model.height
+
+    def get_contrast_text_color(self, bg_color):
+        luminance = 0.299 * bg_color.red() + 0.587 * bg_color.green() + 0.114 * bg_color.blue()
+        return Qt.black if luminance > 128 else Qt.white  
+
+    def get_paint_cache(self):
+        # Brush, pen, label colour and label placement only depend on colour,
+        # border, id and size, so they are rebuilt only when one of those changes.
+        if self.paint_cache is None:
+            if OverlayPainter.label_font is None:
+                OverlayPainter.label_font = QFont("Arial", 12, QFont.Bold)
+            rect = self.rect().adjusted(self.border, self.border, -self.border, -self.border)
+            text = f"ID: {self.overlay_id}" if self.overlay_id is not None else None
+            text_rect = None
+            if text is not None:
+                text_rect = QFontMetrics(OverlayPainter.label_font).boundingRect(rect, Qt.AlignCenter, text)
+            self.paint_cache = (
+                QBrush(self.color),
+                QPen(self.color, self.border),
+                rect,
+                text,
+                QPen(self.get_contrast_text_color(self.color)),
+                text_rect,
+            )
+        return self.paint_cache
+
+    def get_pixmap_key(self):
+        return "overlay:{}x{}:{}:{}:{}:{}:{}".format(
+            self.width(), self.height(), self.color.name(QColor.HexArgb), self.border,
+            self.opacity, self.overlay_id, self.devicePixelRatioF()
+        )
+
+    def get_cached_pixmap(self):
+        if not OverlayPainter.pixmap_cache_ready:
+            # QPixmapCache is shared by every overlay, so this caps the total
+            # memory spent on pre-rendered overlays regardless of their count.
+            QPixmapCache.setCacheLimit(PIXMAP_CACHE_LIMIT_KB)
+            OverlayPainter.pixmap_cache_ready = True
+
+        key = self.get_pixmap_key()
+        if key != self.pixmap_key and self.pixmap_key is not None:
+            QPixmapCache.remove(self.pixmap_key)
+        self.pixmap_key = key
+
+        pixmap = QPixmapCache.find(key)
+        if pixmap is None:
+            ratio = self.devicePixelRatioF()
+            pixmap = QPixmap(round(self.width() * ratio), round(self.height() * ratio))
+            pixmap.setDevicePixelRatio(ratio)
+            pixmap.fill(Qt.transparent)
+            painter = QPainter(pixmap)
+            self.draw_overlay(painter)
+            painter.end()
+            QPixmapCache.insert(key, pixmap)
+        return pixmap
+
+    def draw_overlay(self, painter):
+        brush, pen, rect, text, text_pen, text_rect = self.get_paint_cache()
+
+        painter.setOpacity(self.opacity)  
+        painter.setBrush(brush)
+        painter.setPen(pen)
+        painter.drawRoundedRect(rect, 10, 10)
+
+        if text is not None:
+            painter.setPen(text_pen)
+            painter.setFont(OverlayPainter.label_font)
+            painter.drawText(text_rect, Qt.AlignCenter, text)  
@@ -0,0 +1,130 @@
+from PyQt5.QtWidgets import (QApplication, QStyle, QStyledItemDelegate, QStyleOptionButton)
+from PyQt5.QtGui import QBrush
+from PyQt5.QtCore import Qt, QAbstractTableModel, QEvent, QModelIndex, QVariant, pyqtSignal
+
+from utils.rules import compileRule
+
+HEADERS = ["ID", "App", "Process", "Status", "Active"]
+PROCESS_COLUMN = 2
+STATUS_COLUMN = 3
+TOGGLE_COLUMN = 4
+
+
+class OverlayTableModel(QAbstractTableModel):
+    def __init__(self, collection, processes, parent=None):
+        super().__init__(parent)
+        self.collection = collection
+        self.processes = processes
+        collection.subscribe(self.on_overlay_event)
+        processes.changed.connect(self.on_processes_changed)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.collection)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return HEADERS[section]
+        return QVariant()
+
+    def flags(self, index):
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return QVariant()
+        model = self.collection[index.row()]
+        column = index.column()
+
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return str(model.id)
+            if column == 1:
+                return "Overlay"
+            if column == PROCESS_COLUMN:
+                return model.process
+            if column == STATUS_COLUMN:
+                return "Active" if model.active else "Disabled"
+            if column == TOGGLE_COLUMN:
+                return "Toggle"
+        elif role == Qt.ForegroundRole:
+            if column == STATUS_COLUMN:
+                return QBrush(Qt.green if model.active else Qt.red)
+            if column == PROCESS_COLUMN and not self.process_visible(model.process):
+                return QBrush(Qt.gray)
+        elif role == Qt.ToolTipRole:
+            if column == PROCESS_COLUMN and not self.process_visible(model.process):
+                return "No visible window for this process"
+        elif role == Qt.TextAlignmentRole:
+            if column == STATUS_COLUMN:
+                return Qt.AlignCenter
+        return QVariant()
+
+    def process_visible(self, process):
+        if process == "All" or process in self.processes:
+            return True
+        rule = compileRule(process)
+        return any(rule.process_matches(name) for name in self.processes.process_names())
+
+    def refresh_row(self, row, first_column=0, last_column=len(HEADERS) - 1):
+        self.dataChanged.emit(self.index(row, first_column), self.index(row, last_column))
+
+    def on_overlay_event(self, event, model, changed):
+        # The collection announces changes after applying them; every update
+        # touches a single row, looked up by id rather than scanned for.
+        if event == "reset" or (event == "batch" and any(batched[0] != "changed" for batched in changed)):
+            # Bulk inserts and removals are settled with one reset instead of a
+            # row signal apiece.
+            self.beginResetModel()
+            self.endResetModel()
+        elif event == "batch":
+            rows = [self.collection.row(batched[1].id) for batched in changed]
+            self.dataChanged.emit(self.index(min(rows), 0), self.index(max(rows), len(HEADERS) - 1))
+        elif event == "added":
+            row = self.collection.row(model.id)
+            self.beginInsertRows(QModelIndex(), row, row)
+            self.endInsertRows()
+        elif event == "removed":
+            self.beginRemoveRows(QModelIndex(), changed["row"], changed["row"])
+            self.endRemoveRows()
+        elif event == "changed" and ("process" in changed or "active" in changed):
+            self.refresh_row(self.collection.row(model.id), PROCESS_COLUMN, STATUS_COLUMN)
+
+    def on_processes_changed(self, added, removed):
+        names = added | removed
+        for row, model in enumerate(self.collection):
+            rule = compileRule(model.process)
+            if any(rule.process_matches(name) for name in names):
+                self.refresh_row(row, PROCESS_COLUMN, PROCESS_COLUMN)
+
+
+class ToggleButtonDelegate(QStyledItemDelegate):
+    clicked = pyqtSignal(int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pressed_row = None
+
+    def paint(self, painter, option, index):
+        # Painted like a push button, but no widget exists per row.
+        button = QStyleOptionButton()
+        button.rect = option.rect.adjusted(2, 2, -2, -2)
+        button.text = index.data()
+        button.state = QStyle.State_Enabled
+        button.state |= QStyle.State_Sunken if self.pressed_row == index.row() else QStyle.State_Raised
+        style = option.widget.style() if option.widget is not None else QApplication.style()
+        style.drawControl(QStyle.CE_PushButton, button, painter, option.widget)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() in (QEvent.MouseButtonPress, QEvent.MouseButtonDblClick):
+            if event.button() == Qt.LeftButton:
+                self.pressed_row = index.row()
+                return True
+        elif event.type() == QEvent.MouseButtonRelease:
+            pressed_row, self.pressed_row = self.pressed_row, None
+            if pressed_row == index.row() and option.rect.contains(event.pos()):
+                self.clicked.emit(index.row())
+            return True
+        return False
@@ -1,20 +1,18 @@
 from PyQt5.QtWidgets import (QWidget)
-from PyQt5.QtGui import QColor, QCursor, QPainter, QPen, QBrush, QFont
+from PyQt5.QtGui import QColor, QCursor, QPainter
 from PyQt5.QtCore import Qt
 from models.OverlayEditor import OverlayEditor
+from models.OverlayPainter import OverlayPainter
 
-from utils.helpers import shouldShowOverlay
+from platforms import getBackend
 
-class OverlayWidget(QWidget):
-    def __init__(self, manager, x=0, y=0, width=100, height=100, color=QColor(0, 0, 0), border=0, opacity=1.0, process="All", active=True):
+class OverlayWidget(OverlayPainter, QWidget):
+    def __init__(self, manager, model):
         super().__init__()
         self.manager = manager
-        self.setGeometry(x, y, width, height)
-        self.color = color
-        self.border = border
-        self.opacity = opacity  
-        self.process = process  
-        self.active = active  
+        self.model = model
+        self.init_paint_state()
+        self.setGeometry(*self.screen_geometry())
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.Tool | Qt.WindowTransparentForInput)
         self.setAttribute(Qt.WA_TranslucentBackground)
         self.setMouseTracking(True)
@@ -24,57 +22,39 @@ class OverlayWidget(QWidget):
         self.drag_start_pos = None
         self.resize_direction = None
 
-    def set_opacity(self, opacity):
-        self.opacity = opacity
-        self.setWindowOpacity(opacity)  
-
-    def set_active(self, active):
-        self.active = active
-
-        shouldShowOverlay(self)
-
-        self.manager.update_overlay_data(self)
+    def apply_changes(self, changed):
+        if "x" in changed or "y" in changed or "width" in changed or "height" in changed:
+            self.setGeometry(*self.screen_geometry())
+        if "color" in changed:
+            self.color = QColor(self.model.color)
+        if "color" in changed or "border" in changed:
+            self.paint_cache = None
+        if "opacity" in changed:
+            self.setWindowOpacity(self.model.opacity)
+        if "color" in changed or "border" in changed or "opacity" in changed:
+            self.update()
+
+    def set_origin(self, origin):
+        if origin != self.origin:
+            self.origin = origin
+            self.setGeometry(*self.screen_geometry())
 
     def set_edit_mode(self, is_editing):
         self.is_editing = is_editing
-        flags = Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.Tool
-        if not is_editing:
-            flags |= Qt.WindowTransparentForInput  
-        self.setWindowFlags(flags)
-        shouldShowOverlay(self)
-
-    def get_contrast_text_color(self, bg_color):
-        luminance = 0.299 * bg_color.red() + 0.587 * bg_color.green() + 0.114 * bg_color.blue()
-        return Qt.black if luminance > 128 else Qt.white  
+        getBackend().set_input_transparent([self], not is_editing)
 
     def paintEvent(self, event):
         painter = QPainter(self)
-        painter.setOpacity(self.opacity)  
-        painter.setBrush(QBrush(self.color))
-        painter.setPen(QPen(self.color, self.border))
-
-        rect = self.rect().adjusted(self.border, self.border, -self.border, -self.border)
-        painter.drawRoundedRect(rect, 10, 10)
-
-        if self.manager:
-            overlay_index = self.manager.overlays.index(self) + 1  
-            text = f"ID: {overlay_index}"
-
-            text_color = self.get_contrast_text_color(self.color)  
-            painter.setPen(text_color)
-            painter.setFont(QFont("Arial", 12, QFont.Bold))  
-            text_rect = painter.boundingRect(rect, Qt.AlignCenter, text)  
-            painter.drawText(text_rect, Qt.AlignCenter, text)  
-
-    def update_overlay(self, x, y, width, height, color, border):
-        self.setGeometry(x, y, width, height)
-        self.color = color
-        self.border = border
-        self.update()
+        # While the user drags a resize handle every frame has a new size, so
+        # caching those intermediate pixmaps would only churn the cache.
+        if self.use_pixmap_cache and not self.resizing:
+            painter.drawPixmap(0, 0, self.get_cached_pixmap())
+        else:
+            self.draw_overlay(painter)
 
     def mousePressEvent(self, event):
         if self.is_editing:
-            self.manager.timer.stop()  
+            self.manager.pause_visibility_updates()
             if event.button() == Qt.LeftButton:
                 self.drag_start_pos = event.pos()
                 margin = 10
@@ -118,8 +98,9 @@ class OverlayWidget(QWidget):
             elif self.dragging:
                 self.setCursor(QCursor(Qt.SizeAllCursor))
                 delta = event.pos() - self.drag_start_pos
-                new_x = max(0, self.x() + delta.x())
-                new_y = max(0, self.y() + delta.y())
+                bounds = self.manager.screens.bounds()
+                new_x = max(bounds.left(), self.x() + delta.x())
+                new_y = max(bounds.top(), self.y() + delta.y())
                 self.move(new_x, new_y)
                 self.manager.update_overlay_data(self)
             else:
@@ -135,14 +116,16 @@ class OverlayWidget(QWidget):
                 self.setCursor(QCursor(Qt.ArrowCursor))
 
             self.manager.update_overlay_data(self)
-            self.manager.timer.start()  
+            self.manager.flush_to_json()
+            self.manager.resume_visibility_updates()
 
     def mouseDoubleClickEvent(self, event):
         if self.is_editing:
-            editor = OverlayEditor(self.manager, self, self.manager.overlay_data[self.manager.overlays.index(self)])
+            editor = OverlayEditor(self.manager, self.model)
             editor.exec_()
 
     def resizeEvent(self, event):
+        self.paint_cache = None
         if self.is_editing:
             self.manager.update_overlay_data(self)
 
@@ -170,15 +153,16 @@ class OverlayWidget(QWidget):
 
     def handle_resize(self, event):
         new_x, new_y, new_width, new_height = self.x(), self.y(), self.width(), self.height()
+        bounds = self.manager.screens.bounds()
         if "left" in self.resize_direction:
             delta_x = event.x()
-            new_x = max(0, self.x() + delta_x)
+            new_x = max(bounds.left(), self.x() + delta_x)
             new_width = max(10, self.width() - delta_x)
         if "right" in self.resize_direction:
             new_width = max(10, event.x())
         if "top" in self.resize_direction:
             delta_y = event.y()
-            new_y = max(0, self.y() + delta_y)
+            new_y = max(bounds.top(), self.y() + delta_y)
             new_height = max(10, self.height() - delta_y)
         if "bottom" in self.resize_direction:
             new_height = max(10, event.y())
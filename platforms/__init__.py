@@ -0,0 +1,41 @@
+import os
+import sys
+
+BACKENDS = ("auto", "windows", "x11", "fake")
+
+_backend = None
+
+
+def createBackend(name="auto"):
+    if name == "auto":
+        name = os.environ.get("OVERLAYXPERT_PLATFORM", "auto")
+    if name == "auto":
+        if sys.platform == "win32":
+            name = "windows"
+        elif os.environ.get("DISPLAY"):
+            name = "x11"
+        else:
+            name = "fake"
+
+    if name == "windows":
+        from platforms.windows import WindowsBackend
+        return WindowsBackend()
+    if name == "x11":
+        from platforms.x11 import X11Backend
+        return X11Backend()
+    if name == "fake":
+        from platforms.fake import FakeBackend
+        return FakeBackend()
+    raise ValueError(f"Unknown platform backend: {name}")
+
+
+def setBackend(backend):
+    global _backend
+    _backend = backend
+
+
+def getBackend():
+    global _backend
+    if _backend is None:
+        _backend = createBackend()
+    return _backend
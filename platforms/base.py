@@ -0,0 +1,100 @@
+import psutil
+from PyQt5.QtCore import QObject, Qt, pyqtSignal
+
+from utils.process_cache import process_names
+
+
+class ForegroundEventSource(QObject):
+    changed = pyqtSignal()
+    # Window list sources: a window was retitled, which leaves the list as it is.
+    renamed = pyqtSignal(object)
+
+    def start(self):
+        return False
+
+    def stop(self):
+        pass
+
+
+class WindowGeometrySource(ForegroundEventSource):
+    moved = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.watched = set()
+
+    def watch(self, window):
+        self.watched.add(window)
+
+    def unwatch(self, window):
+        self.watched.discard(window)
+
+
+class PlatformBackend:
+    name = "base"
+
+    def foreground_window(self):
+        raise NotImplementedError
+
+    def window_pid(self, window):
+        raise NotImplementedError
+
+    def visible_windows(self):
+        raise NotImplementedError
+
+    def window_rect(self, window):
+        raise NotImplementedError
+
+    def window_title(self, window):
+        return ""
+
+    def window_class(self, window):
+        return ""
+
+    def create_foreground_event_source(self, parent=None):
+        return None
+
+    def create_window_list_event_source(self, parent=None):
+        return None
+
+    def create_window_geometry_source(self, parent=None):
+        return None
+
+    def process_name(self, pid):
+        return process_names.name(pid)
+
+    def live_pids(self):
+        return psutil.pids()
+
+    def for_worker_thread(self):
+        return self
+
+    def close(self):
+        pass
+
+    def set_windows_visible(self, show, hide):
+        # Receives every transition of one visibility pass at once, so a backend
+        # can turn them into a single native update. Qt's xcb connection already
+        # buffers the map/unmap requests until control returns to the event loop.
+        for widget in hide:
+            widget.hide()
+        for widget in show:
+            widget.show()
+
+    def set_input_transparent(self, widgets, transparent):
+        # QWidget.setWindowFlags destroys and recreates the native window. Recording the
+        # flags on the widget and pushing them to the existing QWindow lets the platform
+        # plugin flip the input-transparent style (WS_EX_TRANSPARENT on Windows, an empty
+        # input shape on X11) in place.
+        for widget in widgets:
+            flags = widget.windowFlags()
+            if transparent:
+                flags |= Qt.WindowTransparentForInput
+            else:
+                flags &= ~Qt.WindowTransparentForInput
+            if flags == widget.windowFlags():
+                continue
+            widget.overrideWindowFlags(flags)
+            handle = widget.windowHandle()
+            if handle is not None:
+                handle.setFlags(flags)
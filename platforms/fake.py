@@ -0,0 +1,123 @@
+from platforms.base import ForegroundEventSource, PlatformBackend, WindowGeometrySource
+
+
+class FakeForegroundSource(ForegroundEventSource):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.running = False
+
+    def start(self):
+        self.running = True
+        return True
+
+    def stop(self):
+        self.running = False
+
+    def trigger(self):
+        if self.running:
+            self.changed.emit()
+
+    def trigger_renamed(self, window):
+        if self.running:
+            self.renamed.emit(window)
+
+
+class FakeGeometrySource(WindowGeometrySource):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.running = False
+
+    def start(self):
+        self.running = True
+        return True
+
+    def stop(self):
+        self.running = False
+
+    def trigger(self, window):
+        if self.running and window in self.watched:
+            self.moved.emit(window)
+
+
+class FakeBackend(PlatformBackend):
+    name = "fake"
+
+    def __init__(self):
+        self.windows = {}
+        self.processes = {}
+        self.foreground = None
+        self.event_sources = []
+        self.window_list_sources = []
+        self.geometry_sources = []
+
+    def add_window(self, window, pid, process, title="", visible=True, rect=(0, 0, 800, 600), window_class=""):
+        self.windows[window] = {"pid": pid, "title": title, "visible": visible, "rect": rect, "class": window_class}
+        self.processes[pid] = process
+        for source in self.window_list_sources:
+            source.trigger()
+
+    def remove_window(self, window):
+        self.windows.pop(window, None)
+        for source in self.window_list_sources:
+            source.trigger()
+        if self.foreground == window:
+            self.set_foreground(None)
+
+    def set_title(self, window, title):
+        # Raised like EVENT_OBJECT_NAMECHANGE on the window list.
+        self.windows[window]["title"] = title
+        for source in self.window_list_sources:
+            source.trigger_renamed(window)
+
+    def move_window(self, window, rect):
+        self.windows[window]["rect"] = rect
+        for source in self.geometry_sources:
+            source.trigger(window)
+
+    def set_foreground(self, window):
+        self.foreground = window
+        for source in self.event_sources:
+            source.trigger()
+
+    def foreground_window(self):
+        return self.foreground
+
+    def window_pid(self, window):
+        info = self.windows.get(window)
+        return info["pid"] if info else None
+
+    def visible_windows(self):
+        return [window for window, info in self.windows.items() if info["visible"] and info["title"]]
+
+    def window_rect(self, window):
+        info = self.windows.get(window)
+        return info["rect"] if info else None
+
+    def window_title(self, window):
+        info = self.windows.get(window)
+        return info["title"] if info else ""
+
+    def window_class(self, window):
+        info = self.windows.get(window)
+        return info["class"] if info else ""
+
+    def process_name(self, pid):
+        return self.processes.get(pid)
+
+    def live_pids(self):
+        return list(self.processes)
+
+    def create_foreground_event_source(self, parent=None):
+        source = FakeForegroundSource(parent)
+        self.event_sources.append(source)
+        return source
+
+    def create_window_list_event_source(self, parent=None):
+        source = FakeForegroundSource(parent)
+        self.window_list_sources.append(source)
+        return source
+
+    def create_window_geometry_source(self, parent=None):
+        source = FakeGeometrySource(parent)
+        self.geometry_sources.append(source)
+        return source
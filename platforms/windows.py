@@ -0,0 +1,209 @@
+import ctypes
+from ctypes import wintypes
+
+import win32gui
+import win32process
+
+from platforms.base import ForegroundEventSource, PlatformBackend, WindowGeometrySource
+
+EVENT_SYSTEM_FOREGROUND = 0x0003
+EVENT_OBJECT_CREATE = 0x8000
+EVENT_OBJECT_HIDE = 0x8003
+EVENT_OBJECT_LOCATIONCHANGE = 0x800B
+EVENT_OBJECT_NAMECHANGE = 0x800C
+OBJID_WINDOW = 0
+GA_ROOT = 2
+WINEVENT_OUTOFCONTEXT = 0x0000
+HWND_TOPMOST = -1
+SWP_NOSIZE = 0x0001
+SWP_NOMOVE = 0x0002
+SWP_NOZORDER = 0x0004
+SWP_NOACTIVATE = 0x0010
+SWP_SHOWWINDOW = 0x0040
+SWP_HIDEWINDOW = 0x0080
+
+WinEventProc = ctypes.WINFUNCTYPE(
+    None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+    wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD
+)
+
+
+def installWinEventHooks(event_ranges, callback, process_id=0):
+    user32 = ctypes.windll.user32
+    user32.SetWinEventHook.restype = wintypes.HANDLE
+    user32.SetWinEventHook.argtypes = [
+        wintypes.DWORD, wintypes.DWORD, wintypes.HMODULE, WinEventProc,
+        wintypes.DWORD, wintypes.DWORD, wintypes.DWORD
+    ]
+    hooks = []
+    for event_min, event_max in event_ranges:
+        hook = user32.SetWinEventHook(event_min, event_max, 0, callback, process_id, 0, WINEVENT_OUTOFCONTEXT)
+        if hook:
+            hooks.append(hook)
+    return hooks
+
+
+def deferWindowVisibility(show, hide):
+    user32 = ctypes.windll.user32
+    user32.BeginDeferWindowPos.restype = wintypes.HANDLE
+    user32.DeferWindowPos.restype = wintypes.HANDLE
+    user32.DeferWindowPos.argtypes = [
+        wintypes.HANDLE, wintypes.HWND, wintypes.HWND,
+        ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int, wintypes.UINT
+    ]
+    user32.EndDeferWindowPos.argtypes = [wintypes.HANDLE]
+
+    positions = user32.BeginDeferWindowPos(len(show) + len(hide))
+    flags = SWP_NOMOVE | SWP_NOSIZE | SWP_NOACTIVATE
+    for hwnd in hide:
+        if positions:
+            positions = user32.DeferWindowPos(positions, hwnd, None, 0, 0, 0, 0, flags | SWP_NOZORDER | SWP_HIDEWINDOW)
+    for hwnd in show:
+        if positions:
+            positions = user32.DeferWindowPos(positions, hwnd, HWND_TOPMOST, 0, 0, 0, 0, flags | SWP_SHOWWINDOW)
+    # A failed DeferWindowPos releases the batch and nothing is applied.
+    return bool(positions) and bool(user32.EndDeferWindowPos(positions))
+
+
+def removeWinEventHooks(hooks):
+    for hook in hooks:
+        ctypes.windll.user32.UnhookWinEvent(hook)
+
+
+class WinEventForegroundSource(ForegroundEventSource):
+    event_ranges = ((EVENT_SYSTEM_FOREGROUND, EVENT_SYSTEM_FOREGROUND),)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._hooks = []
+        self._callback = None
+
+    def start(self):
+        # The callback must stay referenced for as long as the hook is installed.
+        self._callback = WinEventProc(self._on_event)
+        self._hooks = installWinEventHooks(self.event_ranges, self._callback)
+        return bool(self._hooks)
+
+    def stop(self):
+        removeWinEventHooks(self._hooks)
+        self._hooks = []
+
+    def _on_event(self, hook, event, hwnd, id_object, id_child, thread_id, timestamp):
+        self.changed.emit()
+
+
+class WinEventWindowListSource(WinEventForegroundSource):
+    event_ranges = (
+        (EVENT_OBJECT_CREATE, EVENT_OBJECT_HIDE),
+        (EVENT_OBJECT_NAMECHANGE, EVENT_OBJECT_NAMECHANGE),
+    )
+
+    def _on_event(self, hook, event, hwnd, id_object, id_child, thread_id, timestamp):
+        # Object events fire for every control and caret as well; only whole
+        # windows can change the top-level window list.
+        if id_object != OBJID_WINDOW or id_child != 0:
+            return
+        if event != EVENT_OBJECT_NAMECHANGE:
+            self.changed.emit()
+        # Browser tabs, players and downloads retitle themselves constantly; a
+        # title change is reported on its own and never forces a rescan.
+        elif ctypes.windll.user32.GetAncestor(hwnd, GA_ROOT) == hwnd and win32gui.IsWindowVisible(hwnd):
+            self.renamed.emit(hwnd)
+
+
+class WinEventGeometrySource(WindowGeometrySource):
+    event_ranges = ((EVENT_OBJECT_LOCATIONCHANGE, EVENT_OBJECT_LOCATIONCHANGE),)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # pid -> hooks; LOCATIONCHANGE also fires for every cursor and caret
+        # move, so only the processes owning a watched window are hooked.
+        self._hooks = {}
+        self._pids = {}
+        self._callback = None
+
+    def start(self):
+        self._callback = WinEventProc(self._on_event)
+        return True
+
+    def stop(self):
+        for hooks in self._hooks.values():
+            removeWinEventHooks(hooks)
+        self._hooks = {}
+        self._pids = {}
+
+    def watch(self, window):
+        super().watch(window)
+        _, pid = win32process.GetWindowThreadProcessId(window)
+        if not pid or self._callback is None:
+            return
+        self._pids[window] = pid
+        if pid not in self._hooks:
+            self._hooks[pid] = installWinEventHooks(self.event_ranges, self._callback, pid)
+
+    def unwatch(self, window):
+        super().unwatch(window)
+        pid = self._pids.pop(window, None)
+        if pid is not None and pid not in self._pids.values():
+            removeWinEventHooks(self._hooks.pop(pid, []))
+
+    def _on_event(self, hook, event, hwnd, id_object, id_child, thread_id, timestamp):
+        if id_object == OBJID_WINDOW and id_child == 0 and hwnd in self.watched:
+            self.moved.emit(hwnd)
+
+
+class WindowsBackend(PlatformBackend):
+    name = "windows"
+
+    def foreground_window(self):
+        return win32gui.GetForegroundWindow() or None
+
+    def window_pid(self, window):
+        _, pid = win32process.GetWindowThreadProcessId(window)
+        return pid or None
+
+    def visible_windows(self):
+        def is_window_visible(hwnd):
+            return win32gui.IsWindowVisible(hwnd) and win32gui.GetWindowText(hwnd)
+
+        visible_windows = []
+        win32gui.EnumWindows(
+            lambda hwnd, _: visible_windows.append(hwnd)
+            if is_window_visible(hwnd)
+            else None,
+            None,
+        )
+        return visible_windows
+
+    def window_rect(self, window):
+        # Overlays are placed against the client area, below the title bar.
+        try:
+            left, top = win32gui.ClientToScreen(window, (0, 0))
+            _, _, width, height = win32gui.GetClientRect(window)
+        except win32gui.error:
+            return None
+        return left, top, width, height
+
+    def window_title(self, window):
+        return win32gui.GetWindowText(window)
+
+    def window_class(self, window):
+        return win32gui.GetClassName(window)
+
+    def set_windows_visible(self, show, hide):
+        # One BeginDeferWindowPos/EndDeferWindowPos batch maps, unmaps and raises
+        # the native windows together. Qt must still be told, or it would not
+        # paint the shown widgets: after a good batch its show()/hide() find the
+        # windows already in place, after a failed one they do the work themselves.
+        if (show or hide) and not deferWindowVisibility([int(widget.winId()) for widget in show], [int(widget.winId()) for widget in hide]):
+            print("DeferWindowPos failed, showing overlays one by one")
+        super().set_windows_visible(show, hide)
+
+    def create_foreground_event_source(self, parent=None):
+        return WinEventForegroundSource(parent)
+
+    def create_window_list_event_source(self, parent=None):
+        return WinEventWindowListSource(parent)
+
+    def create_window_geometry_source(self, parent=None):
+        return WinEventGeometrySource(parent)
@@ -0,0 +1,203 @@
+from PyQt5.QtCore import QSocketNotifier
+from Xlib import X, Xatom, display, error
+
+from platforms.base import ForegroundEventSource, PlatformBackend, WindowGeometrySource
+
+
+class X11ForegroundSource(ForegroundEventSource):
+    def __init__(self, parent=None, property_name="_NET_ACTIVE_WINDOW", watch_title=False):
+        super().__init__(parent)
+        self.property_name = property_name
+        self.watch_title = watch_title
+        self._display = None
+        self._notifier = None
+        self._active = None
+
+    def start(self):
+        # A dedicated connection, so draining its events never races the backend's queries.
+        try:
+            self._display = display.Display()
+        except error.DisplayError:
+            return False
+
+        self._property_atom = self._display.intern_atom(self.property_name)
+        self._title_atoms = {self._display.intern_atom("_NET_WM_NAME"), Xatom.WM_NAME}
+        self._display.screen().root.change_attributes(event_mask=X.PropertyChangeMask)
+        if self.watch_title:
+            self._follow_active()
+        self._display.flush()
+
+        self._notifier = QSocketNotifier(self._display.fileno(), QSocketNotifier.Read, self)
+        self._notifier.activated.connect(self._drain_events)
+        return True
+
+    def stop(self):
+        if self._notifier is not None:
+            self._notifier.setEnabled(False)
+            self._notifier = None
+        if self._display is not None:
+            self._display.close()
+            self._display = None
+
+    def _follow_active(self):
+        # A title change of the window in front is reported like a focus change,
+        # so title rules are re-checked while it stays in front.
+        root = self._display.screen().root
+        try:
+            prop = root.get_full_property(self._property_atom, X.AnyPropertyType)
+            active = int(prop.value[0]) if prop is not None and prop.value else None
+            if active != self._active:
+                if self._active:
+                    self._display.create_resource_object("window", self._active).change_attributes(event_mask=X.NoEventMask)
+                if active:
+                    self._display.create_resource_object("window", active).change_attributes(event_mask=X.PropertyChangeMask)
+        except (error.BadWindow, error.BadMatch):
+            active = None
+        self._active = active
+
+    def _drain_events(self):
+        changed = False
+        while self._display.pending_events():
+            event = self._display.next_event()
+            if event.type != X.PropertyNotify:
+                continue
+            if event.atom == self._property_atom:
+                changed = True
+            elif self.watch_title and event.atom in self._title_atoms and event.window.id == self._active:
+                changed = True
+        if changed:
+            if self.watch_title:
+                self._follow_active()
+                self._display.flush()
+            self.changed.emit()
+
+
+class X11GeometrySource(WindowGeometrySource):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._display = None
+        self._notifier = None
+
+    def start(self):
+        try:
+            self._display = display.Display()
+        except error.DisplayError:
+            return False
+        self._notifier = QSocketNotifier(self._display.fileno(), QSocketNotifier.Read, self)
+        self._notifier.activated.connect(self._drain_events)
+        return True
+
+    def stop(self):
+        if self._notifier is not None:
+            self._notifier.setEnabled(False)
+            self._notifier = None
+        if self._display is not None:
+            self._display.close()
+            self._display = None
+
+    def watch(self, window):
+        super().watch(window)
+        self._select(window, X.StructureNotifyMask)
+
+    def unwatch(self, window):
+        super().unwatch(window)
+        self._select(window, X.NoEventMask)
+
+    def _select(self, window, mask):
+        if self._display is None:
+            return
+        # Event masks are per client, so this never disturbs other listeners.
+        self._display.create_resource_object("window", window).change_attributes(event_mask=mask)
+        self._display.flush()
+
+    def _drain_events(self):
+        moved = set()
+        while self._display.pending_events():
+            event = self._display.next_event()
+            if event.type == X.ConfigureNotify and event.window.id in self.watched:
+                moved.add(event.window.id)
+        for window in moved:
+            self.moved.emit(window)
+
+
+class X11Backend(PlatformBackend):
+    name = "x11"
+
+    def __init__(self):
+        self.display = display.Display()
+        self.root = self.display.screen().root
+        self.active_window_atom = self.display.intern_atom("_NET_ACTIVE_WINDOW")
+        self.client_list_atom = self.display.intern_atom("_NET_CLIENT_LIST")
+        self.pid_atom = self.display.intern_atom("_NET_WM_PID")
+        self.name_atom = self.display.intern_atom("_NET_WM_NAME")
+
+    def get_property(self, window, atom):
+        try:
+            prop = window.get_full_property(atom, X.AnyPropertyType)
+        except (error.BadWindow, error.BadMatch):
+            return None
+        return prop.value if prop is not None else None
+
+    def foreground_window(self):
+        value = self.get_property(self.root, self.active_window_atom)
+        if not value or not value[0]:
+            return None
+        return int(value[0])
+
+    def window_pid(self, window):
+        value = self.get_property(self.display.create_resource_object("window", window), self.pid_atom)
+        return int(value[0]) if value else None
+
+    def visible_windows(self):
+        visible_windows = []
+        for window_id in self.get_property(self.root, self.client_list_atom) or []:
+            window = self.display.create_resource_object("window", window_id)
+            try:
+                viewable = window.get_attributes().map_state == X.IsViewable
+            except error.BadWindow:
+                continue
+            if viewable and (self.get_property(window, self.name_atom) or window.get_wm_name()):
+                visible_windows.append(int(window_id))
+        return visible_windows
+
+    def for_worker_thread(self):
+        # Xlib connections are not thread-safe, so background work gets its own.
+        return X11Backend()
+
+    def close(self):
+        self.display.close()
+
+    def window_rect(self, window):
+        resource = self.display.create_resource_object("window", window)
+        try:
+            geometry = resource.get_geometry()
+            origin = self.root.translate_coords(resource, 0, 0)
+        except (error.BadWindow, error.BadDrawable):
+            return None
+        return origin.x, origin.y, geometry.width, geometry.height
+
+    def window_title(self, window):
+        resource = self.display.create_resource_object("window", window)
+        title = self.get_property(resource, self.name_atom)
+        if title:
+            return title.decode("utf-8", "replace") if isinstance(title, bytes) else str(title)
+        try:
+            return resource.get_wm_name() or ""
+        except error.BadWindow:
+            return ""
+
+    def window_class(self, window):
+        try:
+            wm_class = self.display.create_resource_object("window", window).get_wm_class()
+        except error.BadWindow:
+            return ""
+        return wm_class[1] if wm_class else ""
+
+    def create_foreground_event_source(self, parent=None):
+        return X11ForegroundSource(parent, watch_title=True)
+
+    def create_window_list_event_source(self, parent=None):
+        return X11ForegroundSource(parent, "_NET_CLIENT_LIST")
+
+    def create_window_geometry_source(self, parent=None):
+        return X11GeometrySource(parent)
@@ -0,0 +1,50 @@
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.persistence import OverlayStore
+
+
+def test_torn_journal_tail_does_not_swallow_later_edits(tmp_path):
+    path = str(tmp_path / "overlays.json")
+    with open(path, "w") as file:
+        json.dump([{"id": 1, "x": 1}], file)
+    with open(path + ".journal", "w") as file:
+        file.write('{"ops":[{"op":"put","id":1,"fi')
+
+    store = OverlayStore(path, delay=0)
+    assert store.load() == [{"id": 1, "x": 1}]
+    store.update(1, {"x": 50})
+    store.flush(wait=True)
+    # The store is never closed, as after a crash.
+
+    recovered = OverlayStore(path, delay=0)
+    assert recovered.load() == [{"id": 1, "x": 50}]
+    recovered.close()
+
+
+def test_legacy_layout_is_upgraded_once(tmp_path):
+    path = str(tmp_path / "overlays.json")
+    with open(path, "w") as file:
+        json.dump([{"id": 1, "x": 100}], file)
+    with open(path + ".journal", "w") as file:
+        file.write('{"ops":[{"op":"put","id":1,"fields":{"x":400}}]}\n')
+    upgraded = []
+
+    def upgrade(record):
+        upgraded.append(record["id"])
+        record["x"] //= 2
+
+    store = OverlayStore(path, delay=0)
+    assert store.load(upgrade) == [{"id": 1, "x": 200}]
+    store.close()
+    with open(path) as file:
+        assert json.load(file) == {"format": 2, "overlays": [{"id": 1, "x": 200}]}
+    assert os.path.getsize(path + ".journal") == 0
+
+    reloaded = OverlayStore(path, delay=0)
+    assert reloaded.load(upgrade) == [{"id": 1, "x": 200}]
+    reloaded.close()
+    assert upgraded == [1]
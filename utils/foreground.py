@@ -0,0 +1,43 @@
+from platforms import getBackend
+
+
+class ForegroundSnapshot:
+    __slots__ = ("hwnd", "pid", "process", "title", "window_class")
+
+    def __init__(self, hwnd=None, pid=None, process=None):
+        self.hwnd = hwnd
+        self.pid = pid
+        self.process = process
+        # Filled in on demand by rules that match on the window itself.
+        self.title = None
+        self.window_class = None
+
+
+def getForegroundSnapshot(previous=None, backend=None, registry=None):
+    backend = backend or getBackend()
+    hwnd = backend.foreground_window()
+    known = registry.process_of(hwnd) if registry is not None and hwnd else None
+    if known is not None:
+        pid, current_process = known
+        if previous is not None and previous.pid == pid and previous.hwnd == hwnd:
+            return previous
+        return ForegroundSnapshot(hwnd, pid, current_process)
+
+    pid = backend.window_pid(hwnd) if hwnd else None
+
+    if previous is not None and previous.pid == pid and previous.hwnd == hwnd:
+        return previous
+
+    current_process = backend.process_name(pid) if pid else None
+    return ForegroundSnapshot(hwnd, pid, current_process)
+
+
+class ForegroundService:
+    def __init__(self, backend=None, registry=None):
+        self.backend = backend
+        self.registry = registry
+        self.snapshot = ForegroundSnapshot()
+
+    def refresh(self):
+        self.snapshot = getForegroundSnapshot(self.snapshot, self.backend, self.registry)
+        return self.snapshot
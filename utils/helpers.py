@@ -1,25 +1,11 @@
+from utils.rules import ruleFor
 
-import psutil
-import win32gui
-import win32process
+def overlayMatches(model, snapshot):
+    return model.active and ruleFor(model).matches(snapshot)
 
-def shouldShowOverlay(self):
-    hwnd = win32gui.GetForegroundWindow()
-    pid = None
-    if hwnd:
-        _, pid = win32process.GetWindowThreadProcessId(hwnd)
-
-    current_process = None
-    if pid:
-        try:
-            current_process = psutil.Process(pid).name()
-        except psutil.NoSuchProcess:
-            pass
-
-    process = self.process
-    should_show = self.active and (process == "All" or process == current_process)
-
-    if should_show and not self.isVisible():  
-        self.show()
-    elif not should_show and self.isVisible():  
-        self.hide()
\ No newline at end of file
+def getResizeDirection(x, y, width, height, margin=10):
+    horizontal = "left" if x <= margin else "right" if x >= width - margin else ""
+    vertical = "top" if y <= margin else "bottom" if y >= height - margin else ""
+    if horizontal and vertical:
+        return f"{vertical}-{horizontal}"
+    return horizontal or vertical or None
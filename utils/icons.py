@@ -0,0 +1,53 @@
+import os
+
+from PyQt5.QtCore import QFile, QResource
+from PyQt5.QtGui import QIcon
+
+ICON_RESOURCE = ":icon.ico"
+ICON_FILES = ("icon.ico", "resources.rcc")
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_app_icon = None
+
+
+def findIconFile():
+    for name in ICON_FILES:
+        path = os.path.join(BASE_DIR, name)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def loadIcon(path=None):
+    path = path or findIconFile()
+    if path is not None and path.endswith(".rcc"):
+        if QResource.registerResource(path):
+            return QIcon(ICON_RESOURCE)
+        print("Failed to register resource file:", path)
+    elif path is not None:
+        return QIcon(path)
+
+    # The embedded resources are a 300 KB module that registers itself on
+    # import, so it is only pulled in when no icon file is around.
+    import resources  # noqa: F401
+    return QIcon(ICON_RESOURCE)
+
+
+def extractIcon(path):
+    # icon.ico only ships inside resources.py; this writes it back out, e.g. to
+    # build resources.rcc from resources.qrc.
+    import resources  # noqa: F401
+    resource = QFile(ICON_RESOURCE)
+    if not resource.open(QFile.ReadOnly):
+        print("Failed to open embedded icon")
+        return None
+    with open(path, "wb") as file:
+        file.write(bytes(resource.readAll()))
+    return path
+
+
+def getAppIcon(path=None):
+    global _app_icon
+    if _app_icon is None:
+        _app_icon = loadIcon(path)
+    return _app_icon
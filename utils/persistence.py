@@ -0,0 +1,256 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# 2: {"format": 2, "overlays": [...]}, positions in device-independent pixels
+# relative to each overlay's monitor. 1: a bare list of records in device pixels.
+LAYOUT_FORMAT = 2
+
+
+def writeJsonAtomic(path, data, indent=4):
+    # Write next to the target so the final rename never crosses a filesystem.
+    temp_path = path + ".tmp"
+    with open(temp_path, "w") as file:
+        json.dump(data, file, indent=indent)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+    syncDirectory(path)
+
+
+def syncDirectory(path):
+    if os.name != "posix":
+        return
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def parseLayout(data):
+    if isinstance(data, list):
+        return data, 1
+    return data.get("overlays", []), data.get("format", LAYOUT_FORMAT)
+
+
+def layoutData(records):
+    return {"format": LAYOUT_FORMAT, "overlays": records}
+
+
+def applyOp(state, op):
+    if op["op"] == "put":
+        record = state.get(op["id"])
+        if record is None:
+            state[op["id"]] = dict(op["fields"], id=op["id"])
+        else:
+            record.update(op["fields"])
+    elif op["op"] == "del":
+        state.pop(op["id"], None)
+
+
+def replayJournal(records, lines):
+    applied = 0
+    state = None
+    for line in lines:
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            # Only the last append can be torn by a crash; everything before it is intact.
+            break
+        for op in entry.get("ops", []):
+            if op["op"] in ("set", "resize"):
+                # Index-addressed ops from journals written before records had ids.
+                if state is not None:
+                    records[:] = state.values()
+                    state = None
+                if op["op"] == "set":
+                    while len(records) <= op["index"]:
+                        records.append({})
+                    records[op["index"]] = op["record"]
+                else:
+                    del records[op["length"]:]
+            else:
+                if state is None:
+                    state = OrderedDict((record.get("id"), record) for record in records)
+                applyOp(state, op)
+        applied += 1
+    if state is not None:
+        records[:] = state.values()
+    return applied
+
+
+class OverlayStore:
+    def __init__(self, path="overlays.json", delay=0.5, journal=True, compact_after=200):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.delay = delay
+        self.journal = journal
+        self.compact_after = compact_after
+        self.next_id = 1
+        self._state = OrderedDict()
+        self._journal_entries = 0
+        self._cond = threading.Condition()
+        self._pending = OrderedDict()
+        self._generation = 0
+        self._written = 0
+        self._last_change = 0.0
+        self._flush_requested = False
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="OverlayStoreWriter", daemon=True)
+        self._thread.start()
+
+    def load(self, upgrade=None):
+        # upgrade(record) converts, in place, a record of an older layout format.
+        records = []
+        layout_format = LAYOUT_FORMAT
+        try:
+            with open(self.path, "r") as file:
+                records, layout_format = parseLayout(json.load(file))
+        except FileNotFoundError:
+            pass
+        except json.JSONDecodeError:
+            # Keep the damaged file around instead of overwriting it on the next save.
+            corrupt_path = self.path + ".corrupt"
+            os.replace(self.path, corrupt_path)
+            print("JSON file corrupt, moved to", corrupt_path)
+
+        replayed = 0
+        lines = []
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, "r") as file:
+                lines = file.read().splitlines()
+            replayed = replayJournal(records, lines)
+
+        assigned = 0
+        self.next_id = max((record.get("id", 0) for record in records), default=0) + 1
+        for record in records:
+            if "id" not in record:
+                record["id"] = self.next_id
+                self.next_id += 1
+                assigned += 1
+
+        with self._cond:
+            self._state = OrderedDict((record["id"], dict(record)) for record in records)
+            if replayed:
+                print("Recovered overlay changes from journal:", replayed)
+            if layout_format < LAYOUT_FORMAT and upgrade is not None:
+                # The journal holds old-format values too, so it is folded into
+                # the old file first; a crash before the converted file is written
+                # then redoes the upgrade instead of replaying them over it.
+                if lines:
+                    self._compact(legacy=True)
+                for record in records:
+                    upgrade(record)
+                self._state = OrderedDict((record["id"], dict(record)) for record in records)
+                self._compact()
+                print("Converted overlay layout to format", LAYOUT_FORMAT)
+            # Any journal left over is folded in and truncated, a torn last line
+            # included; otherwise the next append would land on that same line.
+            elif lines or assigned:
+                self._compact()
+        return records
+
+    def add(self, record):
+        if record.get("id") is None:
+            record["id"] = self.next_id
+        self.next_id = max(self.next_id, record["id"] + 1)
+        self._queue(record["id"], {"op": "put", "id": record["id"], "fields": dict(record)})
+        return record["id"]
+
+    def update(self, record_id, fields):
+        if fields:
+            self._queue(record_id, {"op": "put", "id": record_id, "fields": dict(fields)})
+
+    def remove(self, record_id):
+        self._queue(record_id, {"op": "del", "id": record_id})
+
+    def flush(self, wait=False):
+        with self._cond:
+            target = self._generation
+            self._flush_requested = True
+            self._cond.notify_all()
+            if wait:
+                while self._written < target and self._thread.is_alive():
+                    self._cond.wait()
+
+    def close(self):
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+
+    def _queue(self, record_id, op):
+        with self._cond:
+            # Coalesce per record: repeated updates merge their fields and the
+            # latest value for each field wins.
+            queued = self._pending.get(record_id)
+            if queued is not None and queued["op"] == "put" and op["op"] == "put":
+                queued["fields"].update(op["fields"])
+            else:
+                self._pending[record_id] = op
+            self._generation += 1
+            self._last_change = time.monotonic()
+            self._cond.notify_all()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    break
+
+                if not (self._flush_requested or self._closed):
+                    remaining = self._last_change + self.delay - time.monotonic()
+                    if remaining > 0:
+                        self._cond.wait(remaining)
+                        continue
+
+                ops = list(self._pending.values())
+                generation = self._generation
+                self._pending = OrderedDict()
+                self._flush_requested = False
+
+            self._write(ops)
+
+            with self._cond:
+                self._written = generation
+                self._cond.notify_all()
+
+        if self._journal_entries:
+            self._compact()
+
+    def _write(self, ops):
+        for op in ops:
+            applyOp(self._state, op)
+        try:
+            if self.journal:
+                self._append_journal(ops)
+                if self._journal_entries >= self.compact_after:
+                    self._compact()
+            else:
+                writeJsonAtomic(self.path, layoutData(list(self._state.values())))
+        except OSError as error:
+            print("Failed to save overlays:", error)
+
+    def _append_journal(self, ops):
+        with open(self.journal_path, "a") as file:
+            file.write(json.dumps({"ops": ops}, separators=(",", ":")) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+        self._journal_entries += 1
+
+    def _compact(self, legacy=False):
+        # Journal ops assign absolute values by id, so replaying an old journal
+        # over a freshly compacted snapshot is harmless if we crash before truncating it.
+        records = list(self._state.values())
+        writeJsonAtomic(self.path, records if legacy else layoutData(records))
+        with open(self.journal_path, "w") as file:
+            file.flush()
+            os.fsync(file.fileno())
+        self._journal_entries = 0
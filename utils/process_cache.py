@@ -0,0 +1,83 @@
+import threading
+from collections import OrderedDict
+
+import psutil
+
+
+class ProcessNameCache:
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._names = OrderedDict()
+        self._keys = {}
+        # The editor resolves names on a worker thread while the GUI thread
+        # resolves the foreground process.
+        self._lock = threading.RLock()
+
+    def name(self, pid):
+        try:
+            process = psutil.Process(pid)
+            # A pid can be reused once its process exits, so the creation time
+            # is part of the key and a new process under the same pid misses.
+            key = (pid, process.create_time())
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            self.invalidate(pid)
+            return None
+
+        with self._lock:
+            name = self._names.get(key)
+            if name is not None:
+                self._names.move_to_end(key)
+                self.hits += 1
+                return name
+            self.misses += 1
+
+        try:
+            name = process.name()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            self.invalidate(pid)
+            return None
+
+        with self._lock:
+            self.invalidate(pid)
+            self._names[key] = name
+            self._keys[pid] = key
+            while len(self._names) > self.maxsize:
+                old_key, _ = self._names.popitem(last=False)
+                self._keys.pop(old_key[0], None)
+                self.evictions += 1
+        return name
+
+    def invalidate(self, pid):
+        with self._lock:
+            key = self._keys.pop(pid, None)
+            if key is not None:
+                del self._names[key]
+                self.invalidations += 1
+
+    def prune(self, live_pids):
+        live_pids = set(live_pids)
+        with self._lock:
+            for pid in [pid for pid in self._keys if pid not in live_pids]:
+                self.invalidate(pid)
+
+    def clear(self):
+        with self._lock:
+            self._names.clear()
+            self._keys.clear()
+
+    def stats(self):
+        return {
+            "size": len(self._names),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+process_names = ProcessNameCache()
@@ -0,0 +1,182 @@
+import time
+
+from PyQt5.QtCore import QObject, QThread, QTimer, pyqtSignal
+
+from platforms import getBackend
+from utils.process_cache import process_names
+
+BATCH_INTERVAL = 0.05
+RESCAN_DELAY = 100
+
+
+class WindowScanner(QThread):
+    found = pyqtSignal(list)
+    scanned = pyqtSignal(list)
+
+    def __init__(self, backend, known, parent=None):
+        super().__init__(parent)
+        self.backend = backend
+        self.known = known
+
+    def run(self):
+        backend = self.backend.for_worker_thread()
+        try:
+            windows = backend.visible_windows()
+            process_names.prune(backend.live_pids())
+            batch = []
+            last_emit = time.monotonic()
+            for window in windows:
+                if self.isInterruptionRequested():
+                    return
+                if window in self.known:
+                    continue
+                pid = backend.window_pid(window)
+                batch.append((window, pid, backend.process_name(pid) if pid else None))
+                # Hand windows over in small batches so readers fill in as the
+                # scan goes without a queued signal per window.
+                if time.monotonic() - last_emit >= BATCH_INTERVAL:
+                    self.found.emit(batch)
+                    batch = []
+                    last_emit = time.monotonic()
+            if batch:
+                self.found.emit(batch)
+            self.scanned.emit(windows)
+        finally:
+            if backend is not self.backend:
+                backend.close()
+
+    def stop(self):
+        self.requestInterruption()
+        self.wait()
+
+
+class VisibleProcessRegistry(QObject):
+    changed = pyqtSignal(set, set)
+    windows_changed = pyqtSignal()
+
+    def __init__(self, backend=None, parent=None, title_filter=None):
+        super().__init__(parent)
+        self.backend = backend or getBackend()
+        # title_filter(window): whether a title change of that window matters.
+        self.title_filter = title_filter
+        self.windows = {}
+        self.counts = {}
+        self.scanner = None
+        self.rescan_pending = False
+        self.events = None
+        # Set when the window list changed, or a window event or a relevant title
+        # change arrived, since windows_changed was last emitted.
+        self.windows_dirty = False
+
+        self.rescan_timer = QTimer(self)
+        self.rescan_timer.setSingleShot(True)
+        self.rescan_timer.setInterval(RESCAN_DELAY)
+        self.rescan_timer.timeout.connect(self.refresh)
+
+        self.rename_timer = QTimer(self)
+        self.rename_timer.setSingleShot(True)
+        self.rename_timer.setInterval(RESCAN_DELAY)
+        self.rename_timer.timeout.connect(self.renames_settled)
+
+    def __contains__(self, process):
+        return process in self.counts
+
+    def process_names(self):
+        return list(self.counts)
+
+    def process_of(self, window):
+        return self.windows.get(window)
+
+    def start(self, events=True):
+        if events:
+            source = self.backend.create_window_list_event_source(self)
+            if source is not None and source.start():
+                source.changed.connect(self.schedule_refresh)
+                source.renamed.connect(self.window_renamed)
+                self.events = source
+        self.refresh()
+
+    def stop(self):
+        self.rescan_timer.stop()
+        self.rename_timer.stop()
+        if self.events is not None:
+            self.events.stop()
+            self.events = None
+        if self.scanner is not None:
+            self.scanner.stop()
+
+    def schedule_refresh(self):
+        # Opening or closing one application raises a burst of window events;
+        # they are folded into a single rescan.
+        self.windows_dirty = True
+        if not self.rescan_timer.isActive():
+            self.rescan_timer.start()
+
+    def window_renamed(self, window):
+        if window not in self.windows:
+            # Untitled windows are left out of the list until they get a title.
+            self.schedule_refresh()
+        elif self.title_filter is not None and self.title_filter(window):
+            self.windows_dirty = True
+            if not self.rename_timer.isActive():
+                self.rename_timer.start()
+
+    def renames_settled(self):
+        # A rescan underway reports the change itself once it finishes.
+        if self.windows_dirty and self.scanner is None and not self.rescan_timer.isActive():
+            self.windows_dirty = False
+            self.windows_changed.emit()
+
+    def refresh(self):
+        if self.scanner is not None:
+            self.rescan_pending = True
+            return
+        # Only windows the registry has not seen yet are resolved to a process.
+        self.scanner = WindowScanner(self.backend, set(self.windows), self)
+        self.scanner.found.connect(self.add_windows)
+        self.scanner.scanned.connect(self.remove_missing)
+        self.scanner.finished.connect(self.scan_finished)
+        self.scanner.start()
+
+    def scan_finished(self):
+        self.scanner.deleteLater()
+        self.scanner = None
+        if self.rescan_pending:
+            self.rescan_pending = False
+            self.refresh()
+        elif self.windows_dirty:
+            self.windows_dirty = False
+            self.windows_changed.emit()
+
+    def add_windows(self, entries):
+        added = set()
+        for window, pid, process in entries:
+            if window in self.windows:
+                continue
+            self.windows[window] = (pid, process)
+            if process:
+                count = self.counts.get(process, 0)
+                if count == 0:
+                    added.add(process)
+                self.counts[process] = count + 1
+        if added:
+            self.changed.emit(added, set())
+        if entries:
+            self.windows_dirty = True
+
+    def remove_missing(self, windows):
+        current = set(windows)
+        removed = set()
+        missing = [window for window in self.windows if window not in current]
+        for window in missing:
+            pid, process = self.windows.pop(window)
+            if not process:
+                continue
+            self.counts[process] -= 1
+            if self.counts[process] == 0:
+                del self.counts[process]
+                removed.add(process)
+        if removed:
+            self.changed.emit(set(), removed)
+        if missing:
+            self.windows_dirty = True
@@ -0,0 +1,264 @@
+import fnmatch
+import re
+import time
+from functools import lru_cache
+
+from platforms import getBackend
+
+REGEX_PREFIX = "re:"
+
+
+class TextMatcher:
+    __slots__ = ("exact", "patterns")
+
+    def __init__(self, exact=(), patterns=()):
+        # Process and class names are case-insensitive on Windows, and patterns
+        # already ignore case; exact names are compared casefolded to match.
+        self.exact = frozenset(name.casefold() for name in exact)
+        self.patterns = tuple(patterns)
+
+    def __call__(self, text):
+        text = text or ""
+        return text.casefold() in self.exact or any(pattern.search(text) for pattern in self.patterns)
+
+
+@lru_cache(maxsize=1024)
+def compileText(text, substring=False):
+    # "a.exe, b*.exe, re:^steam" -> any of an exact name, a wildcard or a regex.
+    exact, patterns = [], []
+    for part in (part.strip() for part in text.split(",")):
+        if not part:
+            continue
+        if part.startswith(REGEX_PREFIX):
+            try:
+                patterns.append(re.compile(part[len(REGEX_PREFIX):], re.IGNORECASE))
+            except re.error as error:
+                print("Invalid pattern", repr(part), "-", error)
+        elif "*" in part or "?" in part or "[" in part:
+            patterns.append(re.compile(fnmatch.translate(part), re.IGNORECASE))
+        elif substring:
+            patterns.append(re.compile(re.escape(part), re.IGNORECASE))
+        else:
+            exact.append(part)
+    return TextMatcher(exact, patterns)
+
+
+@lru_cache(maxsize=256)
+def compileSchedule(text):
+    # "18:00-23:30, 06:00-07:00"; a range may wrap past midnight. None when any
+    # part is unreadable: the overlay then never shows rather than always.
+    ranges = []
+    for part in (part.strip() for part in text.split(",")):
+        if not part:
+            continue
+        try:
+            start, end = (value.strip() for value in part.split("-"))
+            ranges.append((parseMinutes(start), parseMinutes(end)))
+        except ValueError:
+            print("Invalid schedule", repr(part), "- expected HH:MM-HH:MM")
+            return None
+    return tuple(ranges)
+
+
+def parseMinutes(value):
+    hours, minutes = value.split(":")
+    hours, minutes = int(hours), int(minutes)
+    if not (0 <= hours <= 24 and 0 <= minutes < 60):
+        raise ValueError(value)
+    return hours * 60 + minutes
+
+
+def currentMinute(now=None):
+    local = time.localtime(now)
+    return local.tm_hour * 60 + local.tm_min
+
+
+class OverlayRule:
+    __slots__ = ("match_all", "process", "title", "window_class", "schedule")
+
+    def __init__(self, process, title, window_class, schedule):
+        self.match_all = process.strip() == "All"
+        self.process = compileText(process)
+        self.title = compileText(title, substring=True) if title else None
+        self.window_class = compileText(window_class) if window_class else None
+        self.schedule = compileSchedule(schedule) if schedule.strip() else ()
+
+    def process_matches(self, process):
+        return self.match_all or self.process(process)
+
+    def window_matches(self, title, window_class):
+        if self.title is not None and not self.title(title):
+            return False
+        if self.window_class is not None and not self.window_class(window_class):
+            return False
+        return True
+
+    def in_schedule(self, minute):
+        if self.schedule is None:
+            return False
+        if not self.schedule:
+            return True
+        for start, end in self.schedule:
+            if start <= end and start <= minute < end:
+                return True
+            if start > end and (minute >= start or minute < end):
+                return True
+        return False
+
+    @property
+    def needs_window(self):
+        return self.title is not None or self.window_class is not None
+
+    @property
+    def conditional(self):
+        return self.needs_window or self.schedule != ()
+
+    def matches(self, snapshot, minute=None, backend=None):
+        if not self.process_matches(snapshot.process):
+            return False
+        return self.constraints_match(snapshot, currentMinute() if minute is None else minute, backend)
+
+    def constraints_match(self, snapshot, minute, backend=None):
+        if not self.in_schedule(minute):
+            return False
+        if self.needs_window:
+            resolveWindow(snapshot, backend)
+            return self.window_matches(snapshot.title, snapshot.window_class)
+        return True
+
+
+@lru_cache(maxsize=1024)
+def compileRule(process, title="", window_class="", schedule=""):
+    return OverlayRule(process, title, window_class, schedule)
+
+
+def resolveWindow(snapshot, backend=None):
+    # Title and class are only queried when a rule asks for them, once per snapshot.
+    if snapshot.title is None:
+        backend = backend or getBackend()
+        snapshot.title = backend.window_title(snapshot.hwnd) if snapshot.hwnd else ""
+        snapshot.window_class = backend.window_class(snapshot.hwnd) if snapshot.hwnd else ""
+
+
+def ruleFor(model):
+    return compileRule(model.process, model.target_title, model.target_class, model.schedule)
+
+
+class VisibilityRules:
+    def __init__(self, backend=None):
+        self.backend = backend
+        self.rules = {}
+        # "All" overlays: those without further conditions never change with
+        # the foreground; the others are re-checked on every change.
+        self.always = set()
+        self.dynamic = set()
+        self.by_process = {}
+        self.by_pattern = {}
+        self.pattern_hits = {}
+        self.constrained = set()
+
+    def rebuild(self, models):
+        self.rules.clear()
+        self.always.clear()
+        self.dynamic.clear()
+        self.by_process.clear()
+        self.by_pattern.clear()
+        self.pattern_hits.clear()
+        self.constrained.clear()
+        for model in models:
+            self.add(model)
+
+    def add(self, model):
+        if not model.active:
+            return
+        rule = ruleFor(model)
+        self.rules[model.id] = rule
+        if rule.match_all:
+            (self.dynamic if rule.conditional else self.always).add(model.id)
+        else:
+            for process in rule.process.exact:
+                self.by_process.setdefault(process, set()).add(model.id)
+            if rule.process.patterns:
+                self.by_pattern[model.id] = rule
+                self.pattern_hits.clear()
+        if rule.conditional:
+            self.constrained.add(model.id)
+
+    def remove(self, overlay_id):
+        rule = self.rules.pop(overlay_id, None)
+        if rule is None:
+            return
+        self.always.discard(overlay_id)
+        self.dynamic.discard(overlay_id)
+        for process in rule.process.exact:
+            overlay_ids = self.by_process.get(process)
+            if overlay_ids is not None:
+                overlay_ids.discard(overlay_id)
+                if not overlay_ids:
+                    del self.by_process[process]
+        if self.by_pattern.pop(overlay_id, None) is not None:
+            self.pattern_hits.clear()
+        self.constrained.discard(overlay_id)
+
+    def update(self, model):
+        self.remove(model.id)
+        self.add(model)
+
+    def pattern_matches(self, process):
+        # Wildcard and regex rules are tried once per distinct process name and
+        # the result kept until a pattern rule changes.
+        hits = self.pattern_hits.get(process)
+        if hits is None:
+            hits = {overlay_id for overlay_id, rule in self.by_pattern.items() if rule.process(process)}
+            self.pattern_hits[process] = hits
+        return hits
+
+    def affected(self, process):
+        # The overlays whose visibility can depend on process being in front;
+        # a focus change only needs to look at those of the old and new process.
+        affected = set(self.dynamic)
+        if process:
+            affected.update(self.by_process.get(process.casefold(), ()))
+            if self.by_pattern:
+                affected.update(self.pattern_matches(process))
+        return affected
+
+    def matching(self, snapshot, now=None):
+        return self.always | self.filter(self.affected(snapshot.process), snapshot, now)
+
+    def filter(self, overlay_ids, snapshot, now=None):
+        minute = currentMinute(now)
+        visible = set()
+        for overlay_id in overlay_ids:
+            rule = self.rules.get(overlay_id)
+            if rule is not None and rule.matches(snapshot, minute, self.backend):
+                visible.add(overlay_id)
+        return visible
+
+    def matches(self, model, snapshot, now=None):
+        rule = self.rules.get(model.id)
+        return rule is not None and rule.matches(snapshot, currentMinute(now), self.backend)
+
+    def window_changed(self, snapshot):
+        # The window in front can be renamed without losing focus. Its cached
+        # title and class are re-read; True when either differs.
+        if snapshot.title is None:
+            return False
+        previous = (snapshot.title, snapshot.window_class)
+        snapshot.title = snapshot.window_class = None
+        resolveWindow(snapshot, self.backend)
+        return (snapshot.title, snapshot.window_class) != previous
+
+    def seconds_to_next_boundary(self, now=None):
+        now = time.time() if now is None else now
+        minute = currentMinute(now)
+        boundaries = {
+            boundary % 1440
+            for overlay_id in self.constrained
+            for schedule in self.rules[overlay_id].schedule or ()
+            for boundary in schedule
+        }
+        if not boundaries:
+            return None
+        delta = min((boundary - minute) % 1440 or 1440 for boundary in boundaries)
+        return delta * 60 - time.localtime(now).tm_sec
@@ -0,0 +1,103 @@
+from PyQt5.QtCore import QObject, QRect, QTimer, pyqtSignal
+from PyQt5.QtWidgets import QApplication
+
+FALLBACK_GEOMETRY = QRect(0, 0, 1920, 1080)
+
+
+class ScreenTable(QObject):
+    changed = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # name -> (logical geometry, device pixel ratio); "" is the primary screen.
+        self.screens = {}
+        self.primary = ""
+        self.virtual = QRect(FALLBACK_GEOMETRY)
+        self.pending = False
+
+        app = QApplication.instance()
+        app.screenAdded.connect(self.on_screen_added)
+        app.screenRemoved.connect(self.on_screen_removed)
+        app.primaryScreenChanged.connect(self.schedule_refresh)
+        for screen in app.screens():
+            self.watch(screen)
+        self.update_table()
+
+    def watch(self, screen):
+        screen.geometryChanged.connect(self.schedule_refresh)
+        screen.logicalDotsPerInchChanged.connect(self.schedule_refresh)
+        screen.physicalDotsPerInchChanged.connect(self.schedule_refresh)
+
+    def on_screen_added(self, screen):
+        self.watch(screen)
+        self.schedule_refresh()
+
+    def on_screen_removed(self, screen):
+        # The screen is still listed while the signal is delivered.
+        self.update_table(removed=screen)
+        self.schedule_refresh()
+
+    def schedule_refresh(self, *args):
+        # Docking or re-arranging monitors reports several screens at once;
+        # listeners hear about it once, with the table already complete.
+        if not self.pending:
+            self.pending = True
+            QTimer.singleShot(0, self.refresh)
+
+    def refresh(self):
+        self.pending = False
+        self.update_table()
+        self.changed.emit()
+
+    def update_table(self, removed=None):
+        app = QApplication.instance()
+        screens = [screen for screen in app.screens() if screen is not removed]
+        self.screens = {screen.name(): (screen.geometry(), screen.devicePixelRatio()) for screen in screens}
+        primary = app.primaryScreen()
+        self.primary = primary.name() if primary is not None and primary is not removed else next(iter(self.screens), "")
+        virtual = QRect()
+        for geometry, ratio in self.screens.values():
+            virtual = virtual.united(geometry)
+        self.virtual = virtual if not virtual.isNull() else QRect(FALLBACK_GEOMETRY)
+
+    def names(self):
+        return list(self.screens)
+
+    def geometry(self, name):
+        # A screen that is gone falls back to the primary one; the overlay keeps
+        # its screen name and returns there once the monitor is back.
+        entry = self.screens.get(name) or self.screens.get(self.primary)
+        return entry[0] if entry is not None else FALLBACK_GEOMETRY
+
+    def origin(self, name):
+        geometry = self.geometry(name)
+        return geometry.x(), geometry.y()
+
+    def bounds(self):
+        return self.virtual
+
+    def screen_at(self, x, y):
+        for name, (geometry, ratio) in self.screens.items():
+            if geometry.contains(x, y):
+                return name
+        return None
+
+    def device_screen(self, x, y):
+        # Like screen_at, for window-system coordinates, which are in device pixels.
+        for name, (geometry, ratio) in self.screens.items():
+            if geometry.x() <= x < geometry.x() + geometry.width() * ratio and geometry.y() <= y < geometry.y() + geometry.height() * ratio:
+                return name
+        return None
+
+    def ratio(self, name):
+        entry = self.screens.get(name) or self.screens.get(self.primary)
+        return entry[1] if entry is not None else 1.0
+
+    def to_logical(self, x, y):
+        # Qt keeps each screen's top-left where it is and scales only the
+        # offsets within the screen.
+        name = self.device_screen(x, y)
+        if name is None:
+            return x, y
+        geometry, ratio = self.screens[name]
+        return geometry.x() + round((x - geometry.x()) / ratio), geometry.y() + round((y - geometry.y()) / ratio)
@@ -0,0 +1,38 @@
+import time
+
+import psutil
+
+from utils.persistence import writeJsonAtomic
+
+
+class StartupProfiler:
+    def __init__(self, start=None):
+        self.start = start if start is not None else time.perf_counter()
+        # perf_counter has no fixed epoch, so the wall clock is kept alongside
+        # it to relate the profile to the process creation time.
+        self.wall_start = time.time() - (time.perf_counter() - self.start)
+        self.last = self.start
+        self.phases = []
+
+    def mark(self, phase, now=None):
+        now = now if now is not None else time.perf_counter()
+        self.phases.append({
+            "phase": phase,
+            "ms": round((now - self.last) * 1000, 3),
+            "at_ms": round((now - self.start) * 1000, 3),
+        })
+        self.last = now
+
+    def to_dict(self):
+        try:
+            interpreter_ms = round((self.wall_start - psutil.Process().create_time()) * 1000, 3)
+        except psutil.Error:
+            interpreter_ms = None
+        return {
+            "interpreter_ms": interpreter_ms,
+            "total_ms": self.phases[-1]["at_ms"] if self.phases else 0.0,
+            "phases": self.phases,
+        }
+
+    def write(self, path):
+        writeJsonAtomic(path, self.to_dict())
@@ -0,0 +1,137 @@
+from PyQt5.QtCore import QObject, QTimer
+
+from platforms import getBackend
+from utils.rules import ruleFor
+
+
+class WindowAnchors(QObject):
+    def __init__(self, manager, backend=None):
+        super().__init__(manager)
+        self.manager = manager
+        self.backend = backend or getBackend()
+        self.bindings = {}
+        self.targets = {}
+        # Ids of anchored overlays, bound or still waiting for their window, so
+        # a focus change never walks the whole collection.
+        self.anchored = set()
+        self.origins = {}
+        self.dirty = set()
+
+        self.source = self.backend.create_window_geometry_source(self)
+        if self.source is not None and self.source.start():
+            self.source.moved.connect(self.window_moved)
+        else:
+            self.source = None
+
+    def is_placed(self, model):
+        return not model.anchor or model.id in self.bindings
+
+    def origin(self, model):
+        window = self.bindings.get(model.id)
+        if window is not None:
+            return self.origins[window]
+        # Everything else is placed relative to its monitor.
+        return self.manager.screens.origin(model.screen)
+
+    def matches(self, rule, window):
+        if not rule.needs_window:
+            return True
+        return rule.window_matches(self.backend.window_title(window), self.backend.window_class(window))
+
+    def find_target(self, model):
+        if not model.anchor:
+            return None
+        rule = ruleFor(model)
+        candidates = [
+            window for window, (pid, process) in self.manager.processes.windows.items()
+            if rule.process_matches(process) and self.matches(rule, window)
+        ]
+        # With several matching windows, the one in front wins.
+        foreground = self.manager.foreground.snapshot.hwnd
+        if foreground in candidates:
+            return foreground
+        return candidates[0] if candidates else None
+
+    def bind(self, model):
+        if model.anchor:
+            self.anchored.add(model.id)
+        else:
+            self.anchored.discard(model.id)
+        window = self.find_target(model)
+        if window == self.bindings.get(model.id):
+            return False
+        self.unbind(model.id)
+        if window is not None:
+            if window not in self.targets:
+                self.targets[window] = set()
+                self.origins[window] = self.query_origin(window)
+                if self.source is not None:
+                    self.source.watch(window)
+            self.targets[window].add(model.id)
+            self.bindings[model.id] = window
+        self.place(model.id)
+        return True
+
+    def unbind(self, overlay_id):
+        window = self.bindings.pop(overlay_id, None)
+        if window is None:
+            return
+        overlay_ids = self.targets[window]
+        overlay_ids.discard(overlay_id)
+        if not overlay_ids:
+            del self.targets[window]
+            del self.origins[window]
+            if self.source is not None:
+                self.source.unwatch(window)
+        self.place(overlay_id)
+
+    def forget(self, overlay_id):
+        self.anchored.discard(overlay_id)
+        self.unbind(overlay_id)
+
+    def rebind_all(self):
+        models = [self.manager.collection.get(overlay_id) for overlay_id in list(self.anchored)]
+        return [model for model in models if model is not None and self.bind(model)]
+
+    def clear(self):
+        self.anchored.clear()
+        for overlay_id in list(self.bindings):
+            self.unbind(overlay_id)
+
+    def place(self, overlay_id):
+        overlay = self.manager.overlays.get(overlay_id)
+        if overlay is not None:
+            overlay.set_origin(self.origin(overlay.model))
+
+    def query_origin(self, window):
+        rect = self.backend.window_rect(window)
+        return self.manager.screens.to_logical(rect[0], rect[1]) if rect is not None else (0, 0)
+
+    def refresh_origins(self):
+        # A monitor change can move windows or change their scale without a move event.
+        for window in self.targets:
+            self.origins[window] = self.query_origin(window)
+
+    def window_moved(self, window):
+        # A drag reports dozens of moves per second; each window is re-queried at
+        # most once per event-loop pass.
+        if not self.dirty:
+            QTimer.singleShot(0, self.flush)
+        self.dirty.add(window)
+
+    def flush(self):
+        dirty, self.dirty = self.dirty, set()
+        for window in dirty:
+            if window not in self.targets:
+                continue
+            origin = self.query_origin(window)
+            if origin == self.origins[window]:
+                continue
+            self.origins[window] = origin
+            # Every overlay bound to this window is moved in the same pass.
+            for overlay_id in self.targets[window]:
+                self.place(overlay_id)
+
+    def stop(self):
+        if self.source is not None:
+            self.source.stop()